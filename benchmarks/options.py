@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+"""
+Measures the time to parse an argument list of a fixed number of tokens as the number of options grows.
+
+A plain Click command builds its parser from every option for each invocation, while a StructCommand reuses
+the flag index that was built the first time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import click
+import msgspec
+
+from msgspec_click import StructCommand, generate_params
+
+
+def make_struct(options: int) -> type[msgspec.Struct]:
+    return msgspec.defstruct('Config', [(f'option_{i}', str, '') for i in range(options)])
+
+
+def make_argv(options: int, tokens: int) -> list[str]:
+    argv: list[str] = []
+    for i in range(tokens // 2):
+        argv.extend((f'--option-{i * 7 % options}', f'value{i}'))
+
+    return argv
+
+
+def measure(command: click.Command, argv: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with command.make_context('bench', list(argv)):
+            pass
+
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--options', type=int, nargs='+', default=[10, 100, 500, 1000, 2000])
+    parser.add_argument('--tokens', type=int, default=1000, help='The number of tokens in the argument list')
+    parser.add_argument('--repeat', type=int, default=50, help='The number of times to parse the argument list')
+    args = parser.parse_args()
+
+    print(f'{args.tokens} tokens, mean of {args.repeat} runs')
+    print(f'{"options":>8} {"click":>10} {"struct":>10}')
+    for options in args.options:
+        struct = make_struct(options)
+        argv = make_argv(options, args.tokens)
+
+        plain = click.Command('bench', params=generate_params(struct))
+        generated = StructCommand('bench', struct=struct)
+        plain_time = measure(plain, argv, args.repeat)
+        struct_time = measure(generated, argv, args.repeat)
+
+        print(
+            f'{options:>8} {plain_time * 1000:>8.2f}ms {struct_time * 1000:>8.2f}ms ({plain_time / struct_time:.2f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
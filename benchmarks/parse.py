@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+"""
+Measures the throughput of parsing many argument lists concurrently against a single generated command.
+
+On free-threaded builds of CPython, throughput should scale with the number of threads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import msgspec
+
+from msgspec_click import StructCommand
+
+
+def make_struct(fields: int) -> type[msgspec.Struct]:
+    return msgspec.defstruct(
+        'Config',
+        [
+            *((f'name_{i}', str, '') for i in range(fields)),
+            *((f'number_{i}', int, 0) for i in range(fields)),
+            *((f'items_{i}', list[int], msgspec.field(default_factory=list)) for i in range(fields)),
+        ],
+    )
+
+
+def make_argv(fields: int, seed: int) -> list[str]:
+    argv: list[str] = []
+    for i in range(fields):
+        argv.extend((f'--name-{i}', f'value{seed}', f'--number-{i}', str(seed)))
+        argv.extend((f'--items-{i}', str(seed), f'--items-{i}', str(i)))
+
+    return argv
+
+
+def parse(command: StructCommand, argv: list[str]) -> dict[str, Any]:
+    with command.make_context('bench', argv) as ctx:
+        return ctx.params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fields', type=int, default=20, help='The number of fields of each type')
+    parser.add_argument('--argvs', type=int, default=5000, help='The number of argument lists to parse')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    struct = make_struct(args.fields)
+    command = StructCommand('bench', struct=struct)
+    argvs = [make_argv(args.fields, seed) for seed in range(args.argvs)]
+
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'Python {sys.version.split()[0]}, GIL {"enabled" if gil_enabled else "disabled"}')
+    print(f'{len(command.params)} options, {len(argvs)} argument lists of {len(argvs[0])} tokens')
+
+    baseline = None
+    for threads in args.threads:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            for _ in executor.map(parse, [command] * len(argvs), argvs, chunksize=64):
+                pass
+            elapsed = time.perf_counter() - start
+
+        throughput = len(argvs) / elapsed
+        baseline = baseline or throughput
+        print(f'{threads:>3} threads: {throughput:>10.0f} argv/s ({throughput / baseline:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+"""
+Compares parsing a set field against parsing a list field and deduplicating the values afterward.
+
+Both the conversion of already parsed values and the full parsing of an argument list are measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable
+
+import msgspec
+
+from msgspec_click import StructCommand
+
+
+class ListConfig(msgspec.Struct):
+    tags: list[str] = []
+
+
+class SetConfig(msgspec.Struct):
+    tags: set[str] = set()
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--elements', type=int, default=100_000, help='The number of values passed')
+    parser.add_argument('--unique', type=int, default=1000, help='The number of distinct values')
+    parser.add_argument('--repeat', type=int, default=3, help='The number of runs, of which the best is shown')
+    args = parser.parse_args()
+
+    values = tuple(f'tag{i % args.unique}' for i in range(args.elements))
+    argv = [token for value in values for token in ('--tags', value)]
+
+    list_command = StructCommand('bench', struct=ListConfig)
+    set_command = StructCommand('bench', struct=SetConfig)
+    list_option = list_command.params[0]
+    set_option = set_command.params[0]
+
+    print(f'{args.elements} values, {args.unique} distinct')
+    with list_command.make_context('bench', []) as list_ctx, set_command.make_context('bench', []) as set_ctx:
+        convert_list = measure(lambda: set(list_option.type_cast_value(list_ctx, values)), args.repeat)
+        convert_set = measure(lambda: set_option.type_cast_value(set_ctx, values), args.repeat)
+
+    print(f'convert  list then set: {convert_list * 1000:>8.2f} ms')
+    print(f'convert  set:           {convert_set * 1000:>8.2f} ms ({convert_list / convert_set:.2f}x)')
+
+    def parse_list() -> set[str]:
+        with list_command.make_context('bench', list(argv)) as ctx:
+            return set(ctx.params['tags'])
+
+    def parse_set() -> set[str]:
+        with set_command.make_context('bench', list(argv)) as ctx:
+            return ctx.params['tags']
+
+    parse_list_time = measure(parse_list, args.repeat)
+    parse_set_time = measure(parse_set, args.repeat)
+    print(f'parse    list then set: {parse_list_time * 1000:>8.2f} ms')
+    print(f'parse    set:           {parse_set_time * 1000:>8.2f} ms ({parse_list_time / parse_set_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,36 @@
 # SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
 #
 # SPDX-License-Identifier: MIT
-from msgspec_click._core import generate_options
+from msgspec_click._command import StructCommand
+from msgspec_click._compose import ComposedOptions, compose_options
+from msgspec_click._core import (
+    LazyValue,
+    OptionSpec,
+    generate_option_specs,
+    generate_options,
+    generate_params,
+)
+from msgspec_click._files import MappedLines, MappedPairs
+from msgspec_click._lazy import LazyStruct
+from msgspec_click._schema import generate_schema
+from msgspec_click._sources import FieldSources, collect_sources
+from msgspec_click._validate import FieldIssue, validate_struct
 
-__all__ = ['generate_options']
+__all__ = [
+    'ComposedOptions',
+    'FieldIssue',
+    'FieldSources',
+    'LazyStruct',
+    'LazyValue',
+    'MappedLines',
+    'MappedPairs',
+    'OptionSpec',
+    'StructCommand',
+    'collect_sources',
+    'compose_options',
+    'generate_option_specs',
+    'generate_options',
+    'generate_params',
+    'generate_schema',
+    'validate_struct',
+]
@@ -0,0 +1,660 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, cast
+
+import click
+import msgspec
+from click.core import ParameterSource
+
+from msgspec_click._core import _add_from_file_options, _get_specs, _to_instance
+from msgspec_click._files import MappedLines, MappedPairs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from msgspec_click._core import Naming
+
+# The attributes of Click's option parser that index parameters by their flags
+PARSER_TABLES = ('_args', '_long_opt', '_opt_prefixes', '_short_opt')
+
+# The environment variable that disables prompting when the command does not choose a mode
+NON_INTERACTIVE_ENV_VAR = 'MSGSPEC_CLICK_NON_INTERACTIVE'
+
+# The key of the context metadata that holds the values read from the file of prompted values per context
+PROMPT_VALUES_KEY = 'msgspec_click.prompt_values'
+
+# The key of the context metadata that holds the options whose prompts were deferred per context
+DEFERRED_PROMPTS_KEY = 'msgspec_click.deferred_prompts'
+
+
+class _Snapshot(msgspec.Struct, frozen=True, gc=False):
+    # The values of fields keyed by the name of the parameter, excluding those of hidden input
+    config: Dict[str, Any]  # noqa: UP006
+    # The names of the sources of parameter values keyed by the name of the parameter
+    sources: Dict[str, str]  # noqa: UP006
+
+
+class StructCommand(click.Command):
+    """
+    A [click.Command][] with parameters generated from a type. The callback receives the parsed values as keyword
+    arguments, exactly like commands to which the output of
+    [`generate_params`][msgspec_click.generate_params] is attached.
+
+    Parameters:
+        struct: The type with which to generate options, see
+            [`generate_options`][msgspec_click.generate_options].
+        batch: Whether to add the `--batch` and `--batch-format` options, which run the callback once per
+            record of a file of newline-delimited JSON objects or a MessagePack array of maps. Each record is
+            merged over the values provided on the command line. Options of required fields are then optional
+            on the command line because values may come from the records instead.
+        help_cache_dir: A directory in which to persist rendered help pages. Help pages are always cached in
+            memory for each terminal width, and are stored on disk if this is set so that subsequent processes
+            may display help without formatting every option again.
+        from_file: Whether to add a `--<field>-from-file` option for every [`list`][] and [`dict`][] field, see
+            [`generate_options`][msgspec_click.generate_options].
+        replay: Whether to add the `--dump-config` and `--replay` options. The former writes the configuration
+            to a MessagePack file before running the callback, along with the
+            [source][click.core.ParameterSource] of each value. Passing such a file as the only option of the
+            latter skips parsing the fields and runs the callback with the decoded configuration. Values of hidden
+            input are never written and are processed again along with parameters that are not fields.
+        interactive: Whether options with the `prompt` key set may prompt for their values. Prompts are always
+            deferred until every other option has been parsed and are then shown together, one after another. If
+            set to `False`, the command instead fails by listing every option that would have prompted. By
+            default, prompting is disabled when the `MSGSPEC_CLICK_NON_INTERACTIVE` environment variable is set
+            to a value other than `0` or `false`.
+        prompt_file: Whether to add the `--prompt-file` option, which reads the values of prompted options from
+            a JSON object keyed by the names of the options. The file is read at once, so secrets may be passed
+            through standard input with `-` or through an inherited file descriptor such as `/dev/fd/3`.
+        naming: How flags are derived from the names of fields, see
+            [`generate_options`][msgspec_click.generate_options].
+
+    All other arguments are passed to [click.Command][].
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        struct: type,
+        batch: bool = False,
+        help_cache_dir: str | os.PathLike[str] | None = None,
+        from_file: bool = False,
+        replay: bool = False,
+        interactive: bool | None = None,
+        prompt_file: bool = False,
+        naming: Naming = 'kebab',
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.struct = struct
+        self.batch = batch
+        self.help_cache_dir = help_cache_dir
+        self.replay = replay
+        self.interactive = interactive
+        self.__required: dict[str, click.Parameter] = {}
+        self.__help_pages: dict[tuple[Any, ...], str] = {}
+        self.__help_params: list[click.Parameter] = []
+        self.__fingerprint: str | None = None
+        self.__help_options: dict[tuple[Any, ...], click.Option | None] = {}
+        self.__parsers: dict[tuple[Any, ...], tuple[list[click.Parameter], type, dict[str, Any]]] = {}
+        # Guards building the cached help options and parser tables, which may be read without it. Building a
+        # parser looks up the help option so the lock must be reentrant.
+        self.__lock = threading.RLock()
+
+        # The names of fields and their parameters
+        self.__fields: list[tuple[str, str]] = []
+        # Values of hidden input, such as passwords, are never written to snapshots
+        self.__hidden: set[str] = set()
+        # Prompts of every option are deferred so that they may be shown together once parsing is done
+        self.__prompted: dict[str, _DeferredPromptMixin] = {}
+        params: list[click.Parameter] = []
+        for field, spec in _get_specs(struct, naming).values():
+            self.__fields.append((field.name, spec.name))
+            settings = dict(spec.settings)
+            if batch and settings.get('required', False):
+                # Arguments are required by default so this must be explicit
+                settings['required'] = False
+                param = msgspec.structs.replace(spec, settings=tuple(settings.items())).to_param()
+                self.__required[spec.name] = param
+            else:
+                param = spec.to_param()
+
+            if isinstance(param, click.Option) and param.hide_input:
+                self.__hidden.add(spec.name)
+
+            if isinstance(param, click.Option) and param.prompt is not None:
+                param.__class__ = _get_deferred_prompt_class(type(param))
+                self.__prompted[spec.name] = cast(_DeferredPromptMixin, param)
+
+            params.append(param)
+
+        self.params.extend(_add_from_file_options(params) if from_file else params)
+
+        if batch:
+            self.params.extend((
+                click.Option(
+                    ['--batch'],
+                    type=click.File('rb'),
+                    help='Run once per record of the file, merging each over the other options.',
+                ),
+                click.Option(
+                    ['--batch-format'],
+                    type=click.Choice(['json', 'msgpack']),
+                    default='json',
+                    show_default=True,
+                    help='The format of the batch file.',
+                ),
+            ))
+
+        self.__replay_option: click.Option | None = None
+        if replay:
+            self.__replay_option = click.Option(
+                ['--replay'],
+                type=click.Path(exists=True, dir_okay=False),
+                expose_value=False,
+                is_eager=True,
+                callback=_reject_replay,
+                help='Run with the configuration of a file written by `--dump-config`, which must be the only option.',
+            )
+            self.params.extend((
+                click.Option(
+                    ['--dump-config'],
+                    type=click.Path(dir_okay=False, writable=True),
+                    help='Write the configuration and the source of each value to a MessagePack file.',
+                ),
+                self.__replay_option,
+            ))
+
+        if prompt_file:
+            self.params.append(
+                click.Option(
+                    ['--prompt-file'],
+                    type=click.File('rb'),
+                    expose_value=False,
+                    callback=_read_prompt_values,
+                    help='Read the values of prompted options from a JSON object, `-` for standard input.',
+                )
+            )
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if self.__replay_option is not None:
+            path = _get_replay_path(args)
+            if path is not None:
+                self.__replay(ctx, self.__replay_option.type.convert(path, self.__replay_option, ctx))
+                ctx.args = []
+                return ctx.args
+
+        args = super().parse_args(ctx, args)
+        if self.__prompted:
+            values = self.__get_prompt_values(ctx)
+            # Records of a batch file may provide the values of prompted options, so prompts are resolved once a
+            # record does not
+            if not (self.batch and ctx.params.get('batch') is not None):
+                self.__resolve_prompts(ctx, values, _pop_deferred_prompts(ctx))
+
+        return args
+
+    def __get_prompt_values(self, ctx: click.Context) -> dict[str, str]:
+        # Metadata is shared by every context of the invocation, such as those of chained commands
+        values: dict[str, str] = ctx.meta.get(PROMPT_VALUES_KEY, {}).get(ctx, {})
+        unknown = values.keys() - self.__prompted.keys()
+        if unknown:
+            message = f'unknown prompted options: {", ".join(sorted(unknown))}'
+            raise click.BadParameter(message, ctx=ctx, param_hint='--prompt-file')
+
+        return values
+
+    def __resolve_prompts(
+        self, ctx: click.Context, values: dict[str, str], deferred: list[_DeferredPromptMixin]
+    ) -> None:
+        interactive = _is_interactive() if self.interactive is None else self.interactive
+        if not interactive:
+            missing = [param.get_error_hint(ctx) for param in deferred if param.name not in values]
+            if missing:
+                message = f'Missing values for prompted options: {", ".join(missing)}'
+                raise click.UsageError(message, ctx=ctx)
+
+        for param in deferred:
+            with click.core.augment_usage_errors(ctx, param=param):
+                name = cast(str, param.name)
+                value = param.process_value(ctx, values[name]) if name in values else param.prompt_now(ctx)
+                # Options that do not expose their value only prompt for the sake of their callbacks
+                if param.expose_value:
+                    ctx.params[name] = value
+
+    def get_help_option(self, ctx: click.Context) -> click.Option | None:
+        # The same instance is returned for every context so that it may be part of the cached parser tables
+        key = (self.add_help_option, *ctx.help_option_names)
+        # The cache may be cleared by another thread building a parser at any time
+        try:
+            return self.__help_options[key]
+        except KeyError:
+            pass
+
+        with self.__lock:
+            if key not in self.__help_options:
+                self.__help_options[key] = super().get_help_option(ctx)
+
+            return self.__help_options[key]
+
+    def make_parser(self, ctx: click.Context) -> Any:
+        # Normalizing tokens depends on the context so the tables cannot be reused
+        if ctx.token_normalize_func is not None:
+            return super().make_parser(ctx)
+
+        key = (self.add_help_option, *ctx.help_option_names)
+        cached = self.__parsers.get(key)
+        # Parameters may be added after the command is created
+        if cached is None or cached[0] != self.params:
+            with self.__lock:
+                # The names of the help option exclude those used by other parameters
+                self.__help_options.clear()
+                parser = super().make_parser(ctx)
+                tables = {name: parser.__dict__.get(name) for name in PARSER_TABLES}
+                # Parsers of other versions of Click are always built from scratch
+                if None not in tables.values():
+                    parser.__class__ = _get_indexed_parser_class(type(parser))
+                    self.__parsers[key] = (list(self.params), type(parser), tables)
+
+            return parser
+
+        # The flags of every option were indexed when the tables were built and parsing never modifies them, so
+        # a new parser only needs the state of the context
+        _, parser_class, tables = cached
+        parser = parser_class(ctx)
+        parser.__dict__.update(tables)
+        return parser
+
+    def get_help(self, ctx: click.Context) -> str:
+        # Parameters may be added after the command is created
+        if self.__help_params != self.params:
+            self.__help_pages.clear()
+            self.__fingerprint = None
+            self.__help_params = list(self.params)
+
+        formatter = ctx.make_formatter()
+        # Defaults and environment variables shown in help may come from the context
+        context_digest = _get_context_digest(ctx)
+        if context_digest is None:
+            self.format_help(ctx, formatter)
+            return formatter.getvalue().rstrip('\n')
+
+        key = (ctx.command_path, formatter.width, context_digest, *ctx.help_option_names)
+        help_page = self.__help_pages.get(key)
+        if help_page is not None:
+            return help_page
+
+        path = None
+        if self.help_cache_dir is not None:
+            fingerprint = self.__get_fingerprint(ctx)
+            if fingerprint:
+                path_digest = hashlib.sha256(ctx.command_path.encode()).hexdigest()[:16]
+                file_name = f'{fingerprint}-{context_digest}-{path_digest}-{formatter.width}.txt'
+                path = os.path.join(self.help_cache_dir, file_name)
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        help_page = f.read()
+                except OSError:
+                    pass
+
+        if help_page is None:
+            self.format_help(ctx, formatter)
+            help_page = formatter.getvalue().rstrip('\n')
+            if path is not None:
+                _write_atomic(path, help_page)
+
+        self.__help_pages[key] = help_page
+        return help_page
+
+    def __get_fingerprint(self, ctx: click.Context) -> str:
+        # An empty fingerprint means that the command cannot be cached on disk
+        if self.__fingerprint is None:
+            info = {
+                'version': _get_version(),
+                'struct': f'{self.struct.__module__}.{self.struct.__qualname__}',
+                'command': self.to_info_dict(ctx),
+            }
+            try:
+                encoded = msgspec.json.encode(info, enc_hook=_encode_stable, order='sorted')
+            except TypeError:
+                self.__fingerprint = ''
+            else:
+                self.__fingerprint = hashlib.sha256(encoded).hexdigest()
+
+        return self.__fingerprint
+
+    def invoke(self, ctx: click.Context) -> Any:
+        dump_path = ctx.params.pop('dump_config', None) if self.replay else None
+        if not self.batch:
+            if dump_path is not None:
+                self.__dump_snapshot(ctx, dump_path)
+
+            return super().invoke(ctx)
+
+        # Replayed configurations never contain the batch options
+        batch_file = ctx.params.pop('batch', None)
+        batch_format = ctx.params.pop('batch_format', 'json')
+        if batch_file is None:
+            for name, option in self.__required.items():
+                if option.value_is_missing(ctx.params.get(name)):
+                    raise click.MissingParameter(ctx=ctx, param=option)
+
+            if dump_path is not None:
+                self.__dump_snapshot(ctx, dump_path)
+
+            return super().invoke(ctx)
+
+        if dump_path is not None:
+            message = '`--dump-config` cannot be combined with `--batch`'
+            raise click.UsageError(message, ctx=ctx)
+
+        if self.callback is None:  # no cov
+            return None
+
+        values = ctx.params
+        # Records are merged over the values of every field, so values read from files are needed in full
+        for _, name in self.__fields:
+            if name in values:
+                values[name] = _read_mapped(values[name])
+
+        deferred = _pop_deferred_prompts(ctx)
+        results: list[Any] = []
+        for number, record in _iter_records(ctx, batch_file, batch_format):
+            unknown = record.keys() - values.keys()
+            if unknown:
+                message = f'record #{number} has unknown fields: {", ".join(sorted(unknown))}'
+                raise click.BadParameter(message, ctx=ctx, param_hint='--batch')
+
+            # Prompts are only shown once, for the first record that does not provide their values
+            unresolved = [param for param in deferred if param.name not in record]
+            if unresolved:
+                self.__resolve_prompts(ctx, self.__get_prompt_values(ctx), unresolved)
+                deferred = [param for param in deferred if param not in unresolved]
+
+            missing = [
+                name
+                for name, option in self.__required.items()
+                if name not in record and option.value_is_missing(values.get(name))
+            ]
+            if missing:
+                message = f'record #{number} is missing required fields: {", ".join(missing)}'
+                raise click.BadParameter(message, ctx=ctx, param_hint='--batch')
+
+            merged = {**values, **record}
+            try:
+                config = _to_instance(self.struct, {name: merged[name] for _, name in self.__fields}, strict=False)
+            except msgspec.ValidationError as e:
+                message = f'record #{number} is invalid: {e}'
+                raise click.BadParameter(message, ctx=ctx, param_hint='--batch') from None
+
+            # Values are taken from the instance so that records have the same types as the command line
+            for field_name, name in self.__fields:
+                merged[name] = getattr(config, field_name)
+
+            results.append(ctx.invoke(self.callback, **merged))
+
+        return results
+
+    def __dump_snapshot(self, ctx: click.Context, path: str) -> None:
+        values = {name: _read_mapped(ctx.params[name]) for _, name in self.__fields}
+        try:
+            config = _to_instance(self.struct, values)
+        except msgspec.ValidationError as e:
+            message = f'cannot dump configuration: {e}'
+            raise click.BadParameter(message, ctx=ctx, param_hint='--dump-config') from None
+
+        values = {name: getattr(config, field_name) for field_name, name in self.__fields if name not in self.__hidden}
+        sources: dict[str, str] = {}
+        for name in values:
+            source = ctx.get_parameter_source(name)
+            if source is not None:
+                sources[name] = source.name
+
+        with open(path, 'wb') as f:
+            f.write(msgspec.msgpack.encode(_Snapshot(config=values, sources=sources)))
+
+    def __replay(self, ctx: click.Context, path: str) -> None:
+        with open(path, 'rb') as f:
+            try:
+                snapshot = _SNAPSHOT_DECODER.decode(f.read())
+            except msgspec.DecodeError as e:
+                message = f'invalid snapshot: {e}'
+                raise click.BadParameter(message, ctx=ctx, param=self.__replay_option) from None
+
+        # Parameters that are not part of the snapshot are processed as if no arguments were passed, such as
+        # those added by decorators and fields of hidden input that were left out
+        recorded = {name for _, name in self.__fields if name not in self.__hidden}
+        params = [param for param in self.get_params(ctx) if param.name not in recorded]
+        for param in click.core.iter_params_for_processing([], params):
+            param.handle_parse_result(ctx, {}, [])
+
+        if self.__prompted:
+            self.__resolve_prompts(ctx, self.__get_prompt_values(ctx), _pop_deferred_prompts(ctx))
+
+        values = {name: ctx.params[name] for name in self.__hidden}
+        values.update(snapshot.config)
+        try:
+            config = _to_instance(self.struct, values, strict=False)
+        except msgspec.ValidationError as e:
+            message = f'invalid snapshot: {e}'
+            raise click.BadParameter(message, ctx=ctx, param=self.__replay_option) from None
+
+        # Values are taken from the instance so that they have the types that the callback would receive
+        for field_name, name in self.__fields:
+            ctx.params[name] = getattr(config, field_name)
+            if name in self.__hidden:
+                continue
+
+            source = ParameterSource.__members__.get(snapshot.sources.get(name, ''))
+            if source is not None:
+                ctx.set_parameter_source(name, source)
+
+
+class _Deferred:
+    def __repr__(self) -> str:
+        return '<deferred prompt>'
+
+
+# The value of options whose prompts were deferred until parsing is done
+DEFERRED = _Deferred()
+
+
+class _DeferredPromptMixin(click.Option):
+    def prompt_for_value(self, ctx: click.Context) -> Any:
+        # Options that do not expose their value never store it, so the options themselves are tracked
+        ctx.meta.setdefault(DEFERRED_PROMPTS_KEY, {}).setdefault(ctx, []).append(self)
+        return DEFERRED
+
+    def process_value(self, ctx: click.Context, value: Any) -> Any:
+        # Conversion, validation and callbacks run once the value has been prompted for
+        return value if value is DEFERRED else super().process_value(ctx, value)
+
+    def prompt_now(self, ctx: click.Context) -> Any:
+        # Click processes the input of prompts unless confirming a flag, and processing again would run callbacks
+        # twice
+        value = super().prompt_for_value(ctx)
+        return super().process_value(ctx, value) if self.is_bool_flag else value
+
+
+def _get_deferred_prompt_class(option_class: type[click.Option]) -> type[click.Option]:
+    deferred_class = _DEFERRED_PROMPT_CLASSES.get(option_class)
+    if deferred_class is None:
+        deferred_class = type(option_class.__name__, (_DeferredPromptMixin, option_class), {})
+        deferred_class = _DEFERRED_PROMPT_CLASSES.setdefault(option_class, deferred_class)
+
+    return deferred_class
+
+
+def _is_interactive() -> bool:
+    return os.environ.get(NON_INTERACTIVE_ENV_VAR, '').lower() in {'', '0', 'false'}
+
+
+def _read_mapped(value: Any) -> Any:
+    if isinstance(value, MappedLines):
+        return value.to_list()
+
+    if isinstance(value, MappedPairs):
+        return value.to_dict()
+
+    return value
+
+
+def _pop_deferred_prompts(ctx: click.Context) -> list[_DeferredPromptMixin]:
+    deferred_prompts = ctx.meta.get(DEFERRED_PROMPTS_KEY)
+    return [] if deferred_prompts is None else deferred_prompts.pop(ctx, [])
+
+
+def _read_prompt_values(ctx: click.Context, param: click.Parameter, value: Any) -> None:
+    if value is None:
+        return
+
+    try:
+        values = msgspec.json.decode(value.read(), type=Dict[str, str])
+    except msgspec.DecodeError as e:
+        message = f'invalid JSON object of strings: {e}'
+        raise click.BadParameter(message, ctx=ctx, param=param) from None
+
+    ctx.meta.setdefault(PROMPT_VALUES_KEY, {})[ctx] = values
+
+
+class _InvocationOrder(list):
+    # Click orders parameters for processing by looking up each of them in the order of invocation, which would
+    # otherwise be a linear search per parameter
+    def __init__(self, order: list[Any]) -> None:
+        super().__init__(order)
+        self.__positions: dict[Any, int] = {}
+        for position, param in enumerate(order):
+            self.__positions.setdefault(param, position)
+
+    def index(self, item: Any, *args: Any) -> int:
+        if args:  # no cov
+            return super().index(item, *args)
+
+        position = self.__positions.get(item)
+        if position is None:
+            raise ValueError(item)
+
+        return position
+
+
+class _IndexedParserMixin:
+    def parse_args(self, args: list[str]) -> Any:
+        opts, largs, order = super().parse_args(args)  # type: ignore[misc]
+        return opts, largs, _InvocationOrder(order)
+
+
+def _get_indexed_parser_class(parser_class: type) -> type:
+    indexed_class = _INDEXED_PARSER_CLASSES.get(parser_class)
+    if indexed_class is None:
+        indexed_class = type(f'Indexed{parser_class.__name__}', (_IndexedParserMixin, parser_class), {})
+        indexed_class = _INDEXED_PARSER_CLASSES.setdefault(parser_class, indexed_class)
+
+    return indexed_class
+
+
+def _get_replay_path(args: list[str]) -> str | None:
+    if len(args) == 2 and args[0] == '--replay':  # noqa: PLR2004
+        return args[1]
+
+    if len(args) == 1 and args[0].startswith('--replay='):
+        return args[0][len('--replay=') :]
+
+    return None
+
+
+def _reject_replay(ctx: click.Context, param: click.Parameter, value: Any) -> None:  # noqa: ARG001
+    if value is not None:
+        message = '`--replay` cannot be combined with other options or arguments'
+        raise click.UsageError(message, ctx=ctx)
+
+
+def _get_context_digest(ctx: click.Context) -> str | None:
+    # Help depending on values that cannot be encoded is never cached
+    settings = {
+        'default_map': ctx.default_map,
+        'show_default': ctx.show_default,
+        'auto_envvar_prefix': ctx.auto_envvar_prefix,
+    }
+    try:
+        encoded = msgspec.json.encode(settings, enc_hook=_encode_stable, order='sorted')
+    except TypeError:
+        return None
+
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _encode_stable(obj: Any) -> Any:
+    # Representations of most objects contain their memory address, which differs between processes
+    qualname = getattr(obj, '__qualname__', None)
+    if not callable(obj) or qualname is None:
+        message = f'cannot encode `{type(obj).__name__}` objects'
+        raise TypeError(message)
+
+    return f'{getattr(obj, "__module__", None)}.{qualname}'
+
+
+@lru_cache(maxsize=None)
+def _get_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version  # noqa: PLC0415
+
+    # Help pages persisted by other versions may differ even when the options are identical
+    try:
+        return version('msgspec-click')
+    except PackageNotFoundError:
+        return ''
+
+
+def _write_atomic(path: str, content: str) -> None:
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        os.replace(temp_path, path)
+    except OSError:
+        # The cache is only an optimization
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _iter_records(ctx: click.Context, f: Any, batch_format: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    items: Iterable[Any]
+    if batch_format == 'msgpack':
+        # MessagePack has no delimiter between objects so the array is decoded at once, leaving each record to be
+        # decoded on its own
+        decoder: Any = msgspec.msgpack.Decoder(Dict[str, Any])
+        try:
+            items = msgspec.msgpack.decode(f.read(), type=List[msgspec.Raw])
+        except msgspec.DecodeError as e:
+            message = f'invalid MessagePack array: {e}'
+            raise click.BadParameter(message, ctx=ctx, param_hint='--batch') from None
+    else:
+        decoder = msgspec.json.Decoder(Dict[str, Any])
+        items = (line for line in f if not line.isspace())
+
+    for number, item in enumerate(items, 1):
+        try:
+            record = decoder.decode(item)
+        except msgspec.DecodeError as e:
+            message = f'record #{number} is malformed: {e}'
+            raise click.BadParameter(message, ctx=ctx, param_hint='--batch') from None
+
+        yield number, record
+
+
+# Subclasses of Click's option parser that return the order of invocation as an indexed list
+_INDEXED_PARSER_CLASSES: dict[type, type] = {}
+
+# Subclasses of option classes that defer prompting until parsing is done
+_DEFERRED_PROMPT_CLASSES: dict[type[click.Option], type[click.Option]] = {}
+
+# Snapshots are typed loosely so that fields left out of them may be merged before conversion
+_SNAPSHOT_DECODER = msgspec.msgpack.Decoder(_Snapshot)
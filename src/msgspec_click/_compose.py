@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+import msgspec
+from msgspec import Struct
+
+from msgspec_click._core import _iter_flags, _to_instance, generate_option_specs
+
+if TYPE_CHECKING:
+    import click
+
+    from msgspec_click._core import Naming, OptionSpec
+
+
+class ComposedOptions(Struct, frozen=True):
+    """
+    The options of multiple types that were combined into a single command.
+    """
+
+    structs: Tuple[type, ...]  # noqa: UP006
+    """The types that were composed, in order."""
+    options: List[click.Option]  # noqa: UP006
+    """The generated [click.Option][] instances of every type."""
+    routes: Dict[str, Tuple[int, str]]  # noqa: UP006
+    """
+    A mapping of option names to the index of the type and the name that the parameter of the field has when
+    the type is not composed, which differs from the option name if the option was namespaced.
+    """
+
+    def split(self, kwargs: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Parameters:
+            kwargs: The parsed values of a command, such as those passed to its callback.
+
+        Returns:
+            A dictionary of values for each type, in order, keyed by the parameter names of their fields as if
+            the type was not composed. Values that do not belong to any type are ignored.
+        """
+        values: list[dict[str, Any]] = [{} for _ in self.structs]
+        routes = self.routes
+        for name, value in kwargs.items():
+            route = routes.get(name)
+            if route is not None:
+                index, param_name = route
+                values[index][param_name] = value
+
+        return values
+
+    def convert(self, kwargs: dict[str, Any]) -> list[Any]:
+        """
+        Parameters:
+            kwargs: The parsed values of a command, such as those passed to its callback.
+
+        Returns:
+            An instance of each type, in order.
+        """
+        return [_to_instance(struct, values) for struct, values in zip(self.structs, self.split(kwargs))]
+
+
+def compose_options(*structs: type, prefix: bool | None = None, naming: Naming = 'kebab') -> ComposedOptions:
+    """
+    Parameters:
+        structs: The types with which to generate options, see
+            [`generate_options`][msgspec_click.generate_options].
+        prefix: Whether to namespace options with the name of their type, e.g. the field `timeout` of the type
+            `HttpConfig` would become `--http-config-timeout`. By default, only options whose flags or names
+            conflict with those of another type are namespaced. If set to `False`, conflicts raise an error.
+        naming: See [`generate_options`][msgspec_click.generate_options].
+
+    Returns:
+        A [ComposedOptions][msgspec_click.ComposedOptions] instance.
+    """
+    all_specs = [generate_option_specs(struct, naming=naming) for struct in structs]
+    param_names = [[spec.name for spec in specs] for specs in all_specs]
+
+    if prefix is None:
+        for locations in _find_conflicts(all_specs).values():
+            for index, position in locations:
+                spec = all_specs[index][position]
+                if spec.name == param_names[index][position]:
+                    all_specs[index][position] = _namespace(structs[index], spec)
+    elif prefix:
+        for index, specs in enumerate(all_specs):
+            all_specs[index] = [_namespace(structs[index], spec) for spec in specs]
+
+    conflicts = _find_conflicts(all_specs)
+    if conflicts:
+        message = '; '.join(
+            f'`{flag}` of ' + ', '.join(f'`{structs[index].__name__}`' for index, _ in locations)
+            for flag, locations in conflicts.items()
+        )
+        message = f'Conflicting options: {message}'
+        raise TypeError(message)
+
+    options: list[click.Option] = []
+    routes: dict[str, tuple[int, str]] = {}
+    for index, specs in enumerate(all_specs):
+        for spec, param_name in zip(specs, param_names[index]):
+            options.append(spec.to_option())
+            routes[spec.name] = (index, param_name)
+
+    return ComposedOptions(structs=structs, options=options, routes=routes)
+
+
+def _find_conflicts(all_specs: list[list[OptionSpec]]) -> dict[str, list[tuple[int, int]]]:
+    # Index the location of every option by each of its flags and its name
+    index: dict[str, list[tuple[int, int]]] = {}
+    for struct_index, specs in enumerate(all_specs):
+        for position, spec in enumerate(specs):
+            for flag in dict.fromkeys([*_iter_flags(spec), spec.name]):
+                index.setdefault(flag, []).append((struct_index, position))
+
+    return {
+        flag: locations
+        for flag, locations in index.items()
+        if len(locations) > 1 and any(location[0] != locations[0][0] for location in locations)
+    }
+
+
+def _namespace(struct: type, spec: OptionSpec) -> OptionSpec:
+    namespace = re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '-', struct.__name__).lower()
+    name = f'{namespace}_{spec.name}'.replace('-', '_')
+
+    params: list[str] = []
+    for param in spec.params:
+        if param.isidentifier():
+            continue
+
+        # Short flags are dropped because they cannot be namespaced
+        flags = [f'--{namespace}-{flag[2:]}' for flag in param.split('/') if flag.startswith('--')]
+        if flags:
+            params.append('/'.join(flags))
+
+    if not params:
+        params.append(f'--{name}'.replace('_', '-'))
+
+    params.append(name)
+    return msgspec.structs.replace(spec, name=name, params=tuple(params))
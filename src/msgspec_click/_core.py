@@ -3,81 +3,655 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, cast
+import ast
+import base64
+import binascii
+import dataclasses
+import linecache
+import mmap
+import os
+import re
+import threading
+from functools import lru_cache, partial
+from inspect import cleandoc, getsourcefile
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Literal, Set, Tuple, Union, cast
+from weakref import WeakKeyDictionary, WeakValueDictionary
 
 import click
-from msgspec import NODEFAULT, inspect
+import msgspec
+from click.core import ParameterSource
+from msgspec import NODEFAULT, Struct, convert, inspect, json
+
+from msgspec_click._files import MappedLines, MappedPairs
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
-    import msgspec
+    from typing_extensions import TypeAlias
+
+    # A strategy for deriving flags from the encoded names of fields
+    Naming: TypeAlias = Union[Literal['kebab', 'snake'], Callable[[str], str]]
 
 SUPPORTED_UNION_LENGTH = 2
 
+# Splits names into words at underscores and changes of case, keeping acronyms such as `HTTP` in `HTTPServer` whole
+WORD_BOUNDARY = re.compile(r'_+|(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+# The key of the context metadata that maps contexts and options to the files from which their values are read
+SOURCE_FILES_KEY = 'msgspec_click.source_files'
+
+
+class OptionSpec(Struct, frozen=True, gc=False):
+    """
+    An immutable, hashable description of a generated option that is cheap to keep around and may be converted
+    to a [click.Option][] on demand. Fields marked as positional arguments are described by the same type, in
+    which case the class is a [click.Argument][].
+    """
+
+    name: str
+    """The encoded name of the field, which is also the name of the option."""
+    params: Tuple[str, ...]  # noqa: UP006
+    """The parameter declarations passed as the first argument to the option class."""
+    cls: type
+    """The [click.Option][] class to instantiate."""
+    settings: Tuple[Tuple[str, Any], ...] = ()  # noqa: UP006
+    """The keyword arguments passed to the option class as sorted key-value pairs."""
+
+    @property
+    def is_argument(self) -> bool:
+        """Whether the spec describes a positional argument rather than an option."""
+        return issubclass(self.cls, click.Argument)
+
+    def to_option(self, *, lazy: bool = False) -> click.Option:
+        """
+        Parameters:
+            lazy: Whether the option should defer the conversion of values until they are
+                [resolved][msgspec_click.LazyValue.resolve].
 
-def generate_options(struct: type[msgspec.Struct]) -> list[click.Option]:
+        Returns:
+            A new [click.Option][] instance.
+        """
+        if self.is_argument:
+            message = f'Field `{self.name}` is a positional argument, use `generate_params` instead'
+            raise TypeError(message)
+
+        return cast('click.Option', self.to_param(lazy=lazy))
+
+    def to_param(self, *, lazy: bool = False) -> click.Parameter:
+        """
+        Parameters:
+            lazy: Whether the parameter should defer the conversion of values until they are
+                [resolved][msgspec_click.LazyValue.resolve].
+
+        Returns:
+            A new [click.Option][] or [click.Argument][] instance.
+        """
+        settings = {key: _thaw(value) for key, value in self.settings}
+        param_class = _get_lazy_class(self.cls) if lazy else self.cls
+        return param_class(list(self.params), **settings)
+
+
+def generate_options(
+    struct: type | dict[str, Any],
+    *,
+    shared: bool = False,
+    lazy: bool = False,
+    from_file: bool = False,
+    naming: Naming = 'kebab',
+) -> list[click.Option]:
     """
     Parameters:
-        struct: The [msgspec.Struct][] type with which to generate options.
+        struct: The [msgspec.Struct][] type with which to generate options, or a JSON schema of one such as
+            the output of [msgspec.json.schema][] or [`generate_schema`][msgspec_click.generate_schema].
+            [Dataclasses][dataclasses], [attrs](https://www.attrs.org) classes and
+            [NamedTuple][typing.NamedTuple] types are also accepted.
+        shared: Whether to return option instances that are shared by every caller using the same type, rather
+            than new instances. Click stores parsed values on the context, so the same option may safely be
+            attached to any number of commands. Shared options raise [`AttributeError`][] when modified since the
+            change would affect every command using them.
+        lazy: Whether options should keep the raw values from the command line as
+            [LazyValue][msgspec_click.LazyValue] instances that are only converted when accessed through a
+            [LazyStruct][msgspec_click.LazyStruct]. Options with a `callback` always convert values eagerly.
+        from_file: Whether to add a `--<field>-from-file` option after the option of every [`list`][] and
+            [`dict`][] field. The file is read lazily one line at a time and the value of the field becomes a
+            [MappedLines][msgspec_click.MappedLines] or [MappedPairs][msgspec_click.MappedPairs] instance when
+            it is passed.
+        naming: How flags are derived from the encoded names of fields that do not set the `params` key. The
+            default `kebab` splits words at underscores and case changes, e.g. `maxRetries` becomes
+            `--max-retries`, while `snake` joins them with underscores instead. A callable receives the encoded
+            name and returns the flag without the leading dashes.
 
     Returns:
         A list of [click.Option][] instances.
     """
-    struct_info = cast(inspect.StructType, inspect.type_info(struct))
+    specs = generate_option_specs(struct, naming=naming)
+    for spec in specs:
+        if spec.is_argument:
+            message = f'Field `{spec.name}` is a positional argument, use `generate_params` instead'
+            raise TypeError(message)
+
+    return cast('list[click.Option]', _to_params(specs, shared=shared, lazy=lazy, from_file=from_file))
+
+
+def generate_params(
+    struct: type | dict[str, Any],
+    *,
+    shared: bool = False,
+    lazy: bool = False,
+    from_file: bool = False,
+    naming: Naming = 'kebab',
+) -> list[click.Parameter]:
+    """
+    Like [`generate_options`][msgspec_click.generate_options], but fields with the `argument` key set to `True`
+    in their metadata become positional [click.Argument][] instances.
+
+    Parameters:
+        struct: The [msgspec.Struct][] type or JSON schema with which to generate parameters.
+        shared: See [`generate_options`][msgspec_click.generate_options].
+        lazy: See [`generate_options`][msgspec_click.generate_options].
+        from_file: See [`generate_options`][msgspec_click.generate_options].
+        naming: See [`generate_options`][msgspec_click.generate_options].
+
+    Returns:
+        A list of [click.Option][] and [click.Argument][] instances, in the order of the fields.
+    """
+    return _to_params(generate_option_specs(struct, naming=naming), shared=shared, lazy=lazy, from_file=from_file)
+
+
+def _to_params(specs: list[OptionSpec], *, shared: bool, lazy: bool, from_file: bool) -> list[click.Parameter]:
+    if not shared:
+        params = [spec.to_param(lazy=lazy) for spec in specs]
+    else:
+        params = [_get_shared_param(spec, lazy=lazy) for spec in specs]
+
+    return _add_from_file_options(params) if from_file else params
+
+
+def _add_from_file_options(params: list[click.Parameter]) -> list[click.Parameter]:
+    with_options: list[click.Parameter] = []
+    for param in params:
+        with_options.append(param)
+        if isinstance(param, (ListOption, DictOption)):
+            with_options.append(_from_file_option(param))
+
+    return with_options
+
+
+def _from_file_option(param: click.Option) -> click.Option:
+    flag = next((opt for opt in param.opts if opt.startswith('--')), f'--{param.name}'.replace('_', '-'))
+    help_text = (
+        'Read `key=value` pairs from a file, one per line.'
+        if isinstance(param, DictOption)
+        else 'Read values from a file, one per line.'
+    )
+    # The option only records the path, which the target option reads when converting its value
+    return click.Option(
+        [f'{flag}-from-file'],
+        type=click.Path(exists=True, dir_okay=False),
+        expose_value=False,
+        is_eager=True,
+        callback=partial(_set_source_file, param),
+        help=help_text,
+    )
+
+
+def _set_source_file(target: click.Parameter, ctx: click.Context, param: click.Parameter, value: Any) -> None:  # noqa: ARG001
+    if value is not None:
+        # Metadata is shared by every context of the invocation, and shared options may belong to several of them
+        ctx.meta.setdefault(SOURCE_FILES_KEY, {})[ctx, target] = value
 
-    options: list[click.Option] = []
-    for field in struct_info.fields:
-        name = field.encode_name
-        default = field.default
-        params: list[str] = []
-        settings: dict[str, Any] = {}
-
-        if isinstance(field.type, inspect.Metadata):
-            field_type = field.type.type
-            extra: dict[str, Any] | None = field.type.extra
-            if extra is not None:
-                params.extend(extra.pop('params', []))
-                settings.update(extra)
-        else:
-            field_type = field.type
 
-        if isinstance(field_type, inspect.UnionType):
-            if len(field_type.types) != SUPPORTED_UNION_LENGTH or not isinstance(field_type.types[1], inspect.NoneType):
-                message = f'Only `TYPE_DEF | None` union types are supported for field `{name}`: {field_type}'
+def _get_source_file(ctx: click.Context, param: click.Parameter) -> str | None:
+    source_files = ctx.meta.get(SOURCE_FILES_KEY)
+    return None if source_files is None else source_files.get((ctx, param))
+
+
+def generate_option_specs(struct: type | dict[str, Any], *, naming: Naming = 'kebab') -> list[OptionSpec]:
+    """
+    Parameters:
+        struct: The [msgspec.Struct][] type or JSON schema with which to generate option specs.
+        naming: See [`generate_options`][msgspec_click.generate_options].
+
+    Returns:
+        A list of [OptionSpec][msgspec_click.OptionSpec] instances.
+    """
+    if isinstance(struct, dict):
+        # The schema bridge builds on the generation of specs from fields, so it is imported when first needed
+        from msgspec_click._schema import _get_schema_specs  # noqa: PLC0415
+
+        specs = _get_schema_specs(struct, naming)
+    else:
+        specs = _get_specs(struct, naming)
+
+    return [spec for _, spec in specs.values()]
+
+
+def _get_specs(struct: type, naming: Naming = 'kebab') -> dict[str, tuple[inspect.Field, OptionSpec]]:
+    # Callables are usually created for every call, so caching by them would keep every one of them alive
+    if callable(naming):
+        return _generate_specs(struct, naming)
+
+    specs = _SPECS.get(struct, {}).get(naming)
+    if specs is None:
+        # Generation happens outside of the lock and the first result to be stored wins, so concurrent callers
+        # always observe the same specs
+        specs = _generate_specs(struct, naming)
+        with _LOCK:
+            specs = _SPECS.setdefault(struct, {}).setdefault(naming, specs)
+
+    return specs
+
+
+def _generate_specs(struct: type, naming: Naming) -> dict[str, tuple[inspect.Field, OptionSpec]]:
+    fields = _get_fields(struct)
+    inherited, inherited_docstrings = _get_inherited_specs(struct, naming)
+    docstrings = _get_docstrings(struct) if inherited else {}
+
+    specs: dict[str, tuple[inspect.Field, OptionSpec]] = {}
+    for field in fields:
+        # Fields that are inherited without changes compare equal to those of the parent, which covers the name,
+        # encode name, type, metadata and default value but not the attribute docstring used as help text
+        entry = inherited.get(field.name)
+        if entry is None or entry[0] != field or docstrings.get(field.name) != inherited_docstrings.get(field.name):
+            entry = (field, _generate_spec(field, struct, naming))
+
+        specs[field.name] = entry
+
+    _check_collisions(specs)
+    return specs
+
+
+def _check_collisions(specs: dict[str, tuple[inspect.Field, OptionSpec]]) -> None:
+    # Index every flag and parameter name by the field that uses it, since Click would silently let the last
+    # option win
+    index: dict[str, str] = {}
+    for field, spec in specs.values():
+        for flag in dict.fromkeys([*_iter_flags(spec), spec.name]):
+            other = index.setdefault(flag, field.encode_name)
+            if other != field.encode_name:
+                message = f'`{flag}` of field `{field.encode_name}` is already used by field `{other}`'
                 raise TypeError(message)
 
-            field_type = field_type.types[0]
-            default = None
 
-        name_flag = f'--{name}'.replace('_', '-')
-        if not params:
-            params.append(name_flag)
-        elif params[-1] != name and name_flag not in params:
-            params.append(name)
+def _iter_flags(spec: OptionSpec) -> list[str]:
+    flags: list[str] = []
+    for param in spec.params:
+        if param.isidentifier():
+            continue
 
-        if field.required:
-            settings['required'] = True
-        elif 'default' not in settings and field.default is not NODEFAULT:
-            settings['default'] = default
+        flags.extend(flag.strip() for flag in param.split('/') if flag.strip())
 
-        ftype = type(field_type)
-        if ftype not in SETTERS:
-            message = f'Unsupported type for field `{name}`: {ftype}'
-            raise TypeError(message)
+    return flags
 
-        setter = SETTERS[ftype]
+
+def _get_inherited_specs(
+    struct: type, naming: Naming
+) -> tuple[dict[str, tuple[inspect.Field, OptionSpec]], dict[str, str]]:
+    for base in struct.__mro__[1:]:
+        if not _has_fields(base):
+            continue
+
+        # Subclasses may override fields with types that would be unsupported on the parent
         try:
-            setter(settings, field_type)
-        except Exception as e:  # noqa: BLE001
-            message = f'Error generating option for field `{name}`, {e}'
-            raise TypeError(message) from None
+            return _get_specs(base, naming), _get_docstrings(base)
+        except TypeError:
+            return {}, {}
+
+    return {}, {}
+
+
+def _to_instance(struct: type, values: dict[str, Any], *, strict: bool = True) -> Any:
+    encode_names = _get_encode_names(struct)
+    if not issubclass(struct, tuple):
+        # Values are keyed by the names of parameters, which only differ from the encoded names of some fields
+        if encode_names:
+            values = {encode_names.get(name, name): value for name, value in values.items()}
+
+        return convert(values, struct, strict=strict)
+
+    # Named tuples are encoded as arrays in the order of their fields, and trailing fields may use their defaults
+    items: list[Any] = []
+    for param_name in _get_param_names(struct).values():
+        if param_name not in values:
+            break
+
+        items.append(values[param_name])
+
+    return convert(items, struct, strict=strict)
+
+
+def _get_encode_names(struct: type) -> dict[str, str]:
+    encode_names = _ENCODE_NAMES.get(struct)
+    if encode_names is None:
+        encode_names = {}
+        for field in _get_fields(struct):
+            param_name = _get_param_name(field)
+            if param_name != field.encode_name:
+                encode_names[param_name] = field.encode_name
+
+        with _LOCK:
+            encode_names = _ENCODE_NAMES.setdefault(struct, encode_names)
+
+    return encode_names
+
+
+def _get_param_names(struct: type) -> dict[str, str]:
+    # Parameters are named after their fields regardless of how flags are named, so the names are read from the
+    # fields without generating options that may only be valid for a particular naming
+    param_names = _PARAM_NAMES.get(struct)
+    if param_names is None:
+        param_names = {field.name: _get_param_name(field) for field in _get_fields(struct)}
+        with _LOCK:
+            param_names = _PARAM_NAMES.setdefault(struct, param_names)
+
+    return param_names
+
+
+def _get_fields(struct: type) -> tuple[inspect.Field, ...]:
+    type_info = inspect.type_info(struct)
+    if not isinstance(type_info, (inspect.StructType, inspect.DataclassType, inspect.NamedTupleType)):
+        message = f'Unsupported type, expected a struct, dataclass, attrs or NamedTuple type: {struct!r}'
+        raise TypeError(message)
+
+    return type_info.fields
+
+
+def _has_fields(cls: type) -> bool:
+    if issubclass(cls, Struct):
+        return cls is not Struct
+
+    # Named tuples cannot be extended with new fields, so only dataclasses and attrs classes are inherited from
+    return dataclasses.is_dataclass(cls) or hasattr(cls, '__attrs_attrs__')
+
+
+def _generate_spec(field: inspect.Field, struct: type | None, naming: Naming = 'kebab') -> OptionSpec:
+    name = field.encode_name
+    param_name = _get_param_name(field)
+    default = field.default
+    params: list[str] = []
+    settings: dict[str, Any] = {}
+
+    if isinstance(field.type, inspect.Metadata):
+        field_type = field.type.type
+        extra: dict[str, Any] | None = field.type.extra
+        if extra is not None:
+            # The metadata is shared by every type using the annotation so it must never be modified
+            settings.update(extra)
+            params.extend(settings.pop('params', []))
+            aliases = settings.pop('aliases', [])
+        else:
+            aliases = []
+
+        if 'help' not in settings and field.type.extra_json_schema is not None:
+            help_text = field.type.extra_json_schema.get('description') or field.type.extra_json_schema.get('title')
+            if help_text:
+                settings['help'] = help_text
+    else:
+        field_type = field.type
+        aliases = []
+
+    argument = settings.pop('argument', False)
+    if argument and params:
+        message = f'Positional argument for field `{name}` cannot set `params`'
+        raise TypeError(message)
+
+    if 'help' not in settings and struct is not None:
+        help_text = _get_docstrings(struct).get(field.name)
+        if help_text:
+            settings['help'] = help_text
+
+    if isinstance(field_type, inspect.UnionType):
+        if len(field_type.types) != SUPPORTED_UNION_LENGTH or not isinstance(field_type.types[1], inspect.NoneType):
+            message = f'Only `TYPE_DEF | None` union types are supported for field `{name}`: {field_type}'
+            raise TypeError(message)
+
+        field_type = field_type.types[0]
+        default = None
+        optional = True
+    else:
+        optional = False
+
+    if argument:
+        if aliases:
+            message = f'Positional argument for field `{name}` cannot set `aliases`'
+            raise TypeError(message)
+
+        params.append(param_name)
+    else:
+        if not params:
+            name_flag = f'--{_derive_flag(name, naming)}'
+            # Optional flags may be turned off explicitly, which leaves them unset when neither flag is passed
+            params.append(
+                f'{name_flag}/--no-{name_flag[2:]}'
+                if optional and isinstance(field_type, inspect.BoolType)
+                else name_flag
+            )
+
+        params.extend(aliases)
+        # Click derives the name of an option from its longest flag, which the name of the field may not match
+        if not any(param.isidentifier() for param in params) and _get_click_name(params) != param_name:
+            params.append(param_name)
+
+    if field.required:
+        settings['required'] = True
+    elif 'default' not in settings and field.default is not NODEFAULT:
+        settings['default'] = default
+
+    ftype = type(field_type)
+    if ftype not in SETTERS:
+        message = f'Unsupported type for field `{name}`: {ftype}'
+        raise TypeError(message)
+
+    setter = SETTERS[ftype]
+    try:
+        setter(settings, field_type)
+        if argument:
+            _set_argument(settings)
+    except Exception as e:  # noqa: BLE001
+        message = f'Error generating option for field `{name}`, {e}'
+        raise TypeError(message) from None
+
+    if not argument:
+        constraints = _describe_constraints(field_type)
+        if constraints:
+            settings['help'] = f'{settings["help"]}  [{constraints}]' if settings.get('help') else f'[{constraints}]'
+
+        if not settings.get('hide_input', False):
+            settings.setdefault('show_default', True)
+
+    option_class = settings.pop('cls', click.Option)
+    return OptionSpec(
+        name=param_name,
+        params=tuple(params),
+        cls=option_class,
+        settings=tuple(sorted((key, _freeze(value)) for key, value in settings.items())),
+    )
+
+
+def _get_param_name(field: inspect.Field) -> str:
+    # Parameters are keyed by their name, which must be an identifier
+    if field.encode_name.isidentifier():
+        return field.encode_name
+
+    if field.name.isidentifier():
+        return field.name
+
+    return re.sub(r'\W|^(?=\d)', '_', field.name)
+
+
+def _derive_flag(name: str, naming: Naming) -> str:
+    if callable(naming):
+        return naming(name)
+
+    words = [word.lower() for word in WORD_BOUNDARY.split(name.replace('-', '_')) if word]
+    return ('-' if naming == 'kebab' else '_').join(words)
+
+
+def _get_click_name(params: list[str]) -> str:
+    # Flags with the longest prefix take precedence, and then the first one
+    flags = [param.split('/')[0].strip() for param in params]
+    flag = max(flags, key=lambda flag: 2 if flag[1:2] == flag[:1] else 1)
+    return flag.lstrip(flag[0]).replace('-', '_').lower()
+
+
+def _get_docstrings(struct: type) -> dict[str, str]:
+    docstrings = _DOCSTRINGS.get(struct)
+    if docstrings is None:
+        docstrings = {}
+        for cls in reversed(struct.__mro__):
+            if cls is not object:
+                docstrings.update(_parse_docstrings(cls))
+
+        with _LOCK:
+            docstrings = _DOCSTRINGS.setdefault(struct, docstrings)
+
+    return docstrings
+
+
+def _parse_docstrings(cls: type) -> dict[str, str]:
+    try:
+        filename = getsourcefile(cls)
+    except (OSError, TypeError):
+        return {}
+
+    if filename is None:
+        return {}
+
+    return _parse_module_docstrings(filename).get(cls.__qualname__) or {}
+
+
+@lru_cache(maxsize=None)
+def _parse_module_docstrings(filename: str) -> dict[str, dict[str, str] | None]:
+    # The entire module is parsed once and the attribute docstrings of every class are indexed by qualified name
+    source = ''.join(linecache.getlines(filename))
+    try:
+        module = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {}
+
+    classes: dict[str, dict[str, str] | None] = {}
+    stack: list[tuple[ast.AST, str]] = [(module, '')]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                qualname = f'{prefix}{child.name}'
+                # Classes defined more than once with the same qualified name cannot be told apart
+                classes[qualname] = None if qualname in classes else _find_attribute_docstrings(child)
+                stack.append((child, f'{qualname}.'))
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                stack.append((child, f'{prefix}{child.name}.<locals>.'))
+            else:
+                stack.append((child, prefix))
+
+    return classes
+
+
+def _find_attribute_docstrings(class_def: ast.ClassDef) -> dict[str, str]:
+    # Attribute docstrings are string literals directly following an annotated assignment
+    docstrings: dict[str, str] = {}
+    for node, next_node in zip(class_def.body, class_def.body[1:]):
+        if (
+            isinstance(node, ast.AnnAssign)
+            and isinstance(node.target, ast.Name)
+            and isinstance(next_node, ast.Expr)
+            and isinstance(next_node.value, ast.Constant)
+            and isinstance(next_node.value.value, str)
+        ):
+            docstrings[node.target.id] = cleandoc(next_node.value.value)
+
+    return docstrings
+
+
+def _describe_constraints(field_type: inspect.Type) -> str:
+    constraints: list[str] = []
+
+    min_length = getattr(field_type, 'min_length', None)
+    max_length = getattr(field_type, 'max_length', None)
+    if min_length is not None and max_length is not None:
+        constraints.append(f'{min_length}<=length<={max_length}')
+    elif min_length is not None:
+        constraints.append(f'length>={min_length}')
+    elif max_length is not None:
+        constraints.append(f'length<={max_length}')
+
+    pattern = getattr(field_type, 'pattern', None)
+    if pattern is not None:
+        constraints.append(f'pattern: {pattern}')
+
+    # Numeric bounds are displayed by Click's range types
+    multiple_of = getattr(field_type, 'multiple_of', None)
+    if multiple_of is not None:
+        constraints.append(f'multiple of {multiple_of}')
+
+    return '; '.join(constraints)
+
+
+def _get_shared_param(spec: OptionSpec, *, lazy: bool) -> click.Parameter:
+    key = (spec, lazy)
+    try:
+        param = _SHARED_PARAMS.get(key)
+    except TypeError:
+        # Settings that were passed through from metadata may not be hashable
+        return spec.to_param(lazy=lazy)
+
+    if param is None:
+        param = spec.to_param(lazy=lazy)
+        # Modifying the instance would affect every command using it
+        param.__class__ = _get_frozen_class(type(param))
+        with _LOCK:
+            param = _SHARED_PARAMS.setdefault(key, param)
+
+    return param
+
+
+def _get_lazy_class(param_class: type[click.Parameter]) -> type[click.Parameter]:
+    lazy_class = _LAZY_CLASSES.get(param_class)
+    if lazy_class is None:
+        lazy_class = type(f'Lazy{param_class.__name__}', (_LazyParameterMixin, param_class), {})
+        with _LOCK:
+            lazy_class = _LAZY_CLASSES.setdefault(param_class, lazy_class)
+
+    return lazy_class
+
+
+def _get_frozen_class(param_class: type[click.Parameter]) -> type[click.Parameter]:
+    frozen_class = _FROZEN_CLASSES.get(param_class)
+    if frozen_class is None:
+        # The name is kept so that the representation of the instance does not change
+        frozen_class = type(param_class.__name__, (_FrozenParameterMixin, param_class), {})
+        with _LOCK:
+            frozen_class = _FROZEN_CLASSES.setdefault(param_class, frozen_class)
+
+    return frozen_class
+
 
-        option_class = settings.pop('cls', click.Option)
-        option = option_class(params, **settings)
-        options.append(option)
+class _FrozenList(tuple):
+    __slots__ = ()
 
-    return options
+
+class _FrozenDict(tuple):
+    __slots__ = ()
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, _FrozenList):
+        return [_thaw(item) for item in value]
+
+    if isinstance(value, _FrozenDict):
+        return {key: _thaw(item) for key, item in value}
+
+    return value
 
 
 def _set_str(
@@ -103,9 +677,18 @@ def _set_int(
     assert isinstance(field_type, inspect.IntType)  # noqa: S101
 
     if not settings.get('count', False):
-        settings['type'] = int
-    elif not isinstance(settings.get('default', []), list):
-        settings['default'] = []
+        if field_type.ge is None and field_type.gt is None and field_type.le is None and field_type.lt is None:
+            settings['type'] = int
+        else:
+            settings['type'] = click.IntRange(
+                min=field_type.gt if field_type.ge is None else field_type.ge,
+                max=field_type.lt if field_type.le is None else field_type.le,
+                min_open=field_type.gt is not None,
+                max_open=field_type.lt is not None,
+            )
+    elif isinstance(settings.get('default'), list):
+        # Counts used to require an empty list as the default, which is still accepted as meaning zero
+        settings['default'] = 0
 
 
 def _set_float(
@@ -114,7 +697,27 @@ def _set_float(
 ) -> None:
     assert isinstance(field_type, inspect.FloatType)  # noqa: S101
 
-    settings['type'] = float
+    if field_type.ge is None and field_type.gt is None and field_type.le is None and field_type.lt is None:
+        settings['type'] = float
+    else:
+        settings['type'] = click.FloatRange(
+            min=field_type.gt if field_type.ge is None else field_type.ge,
+            max=field_type.lt if field_type.le is None else field_type.le,
+            min_open=field_type.gt is not None,
+            max_open=field_type.lt is not None,
+        )
+
+
+def _set_bytes(settings: dict[str, Any], field_type: inspect.Type) -> None:
+    assert isinstance(field_type, (inspect.BytesType, inspect.ByteArrayType, inspect.MemoryViewType))  # noqa: S101
+
+    settings['type'] = BytesParamType(BYTES_KINDS[type(field_type)])
+    if 'default' not in settings and not settings.get('required', False):
+        # Fields of mutable types have default factories, so an empty value is converted into a new instance
+        settings['default'] = b''
+
+    # Binary defaults are not meaningful when displayed
+    settings.setdefault('show_default', False)
 
 
 def _set_list(settings: dict[str, Any], field_type: inspect.Type) -> None:
@@ -141,6 +744,30 @@ def _set_list(settings: dict[str, Any], field_type: inspect.Type) -> None:
         settings['multiple'] = True
 
 
+def _set_set(settings: dict[str, Any], field_type: inspect.Type) -> None:
+    assert isinstance(field_type, (inspect.SetType, inspect.FrozenSetType))  # noqa: S101
+
+    item_type = field_type.item_type
+    itype = type(item_type)
+    click_type: click.ParamType
+    if itype in {inspect.StrType, inspect.AnyType}:
+        click_type = click.STRING
+    elif itype is inspect.IntType:
+        click_type = click.INT
+    elif itype is inspect.FloatType:
+        click_type = click.FLOAT
+    elif itype is inspect.BoolType:
+        click_type = click.BOOL
+    else:
+        message = f'type of item is unsupported: {itype}'
+        raise TypeError(message)
+
+    settings['cls'] = SetOption
+    settings['type'] = click_type
+    if 'nargs' not in settings:
+        settings['multiple'] = True
+
+
 def _set_tuple(settings: dict[str, Any], field_type: inspect.Type) -> None:
     assert isinstance(field_type, inspect.TupleType)  # noqa: S101
 
@@ -195,11 +822,51 @@ def _set_var_tuple(settings: dict[str, Any], field_type: inspect.Type) -> None:
 def _set_dict(settings: dict[str, Any], field_type: inspect.Type) -> None:
     assert isinstance(field_type, inspect.DictType)  # noqa: S101
 
-    if not isinstance(field_type.key_type, inspect.StrType):
-        message = 'only `str` keys are supported'
+    key_type = field_type.key_type
+    value_type = field_type.value_type
+    if isinstance(key_type, inspect.StrType) and isinstance(value_type, PRIMITIVE_TYPES):
+        _set_primitive_dict(settings, value_type)
+        return
+
+    key_click_type: click.ParamType
+    if isinstance(key_type, (inspect.StrType, inspect.AnyType)):
+        key_click_type = click.STRING
+    elif isinstance(key_type, inspect.IntType):
+        key_click_type = click.INT
+    elif isinstance(key_type, inspect.FloatType):
+        key_click_type = click.FLOAT
+    elif isinstance(key_type, inspect.LiteralType):
+        key_click_type = click.Choice([str(value) for value in key_type.values])
+    else:
+        message = 'only `str`, `int`, `float` and `Literal` keys are supported'
         raise TypeError(message)
 
-    itype = type(field_type.value_type)
+    try:
+        mapping_type = _to_python_type(field_type)
+    except TypeError:
+        message = f'type of value is unsupported: {type(value_type)}'
+        raise TypeError(message) from None
+
+    # Values of collections and structs are passed as JSON, everything else is converted from strings
+    settings['cls'] = MappingOption
+    settings['mapping_type'] = mapping_type
+    settings['json_values'] = _is_json_value(value_type)
+    settings['type'] = click.Tuple([key_click_type, click.STRING])
+    settings['multiple'] = True
+
+
+def _is_json_value(value_type: inspect.Type) -> bool:
+    if isinstance(value_type, inspect.Metadata):
+        return _is_json_value(value_type.type)
+
+    if isinstance(value_type, inspect.UnionType):
+        return any(_is_json_value(item_type) for item_type in value_type.types)
+
+    return isinstance(value_type, JSON_VALUE_TYPES)
+
+
+def _set_primitive_dict(settings: dict[str, Any], value_type: inspect.Type) -> None:
+    itype = type(value_type)
     click_type: click.ParamType
     if itype in {inspect.StrType, inspect.AnyType}:
         click_type = click.STRING
@@ -207,31 +874,84 @@ def _set_dict(settings: dict[str, Any], field_type: inspect.Type) -> None:
         click_type = click.INT
     elif itype is inspect.FloatType:
         click_type = click.FLOAT
-    elif itype is inspect.BoolType:
-        click_type = click.BOOL
     else:
-        message = f'type of value is unsupported: {itype}'
-        raise TypeError(message)
+        click_type = click.BOOL
 
     settings['cls'] = DictOption
     settings['type'] = click.Tuple([click.STRING, click_type])
     settings['multiple'] = True
 
 
+def _to_python_type(field_type: inspect.Type) -> Any:
+    # Rebuilds the annotation of a nested type so that values may be converted in bulk, constraints are not
+    # needed since they are validated when the final value is converted
+    # Generic aliases of `typing` are used since builtin collections cannot be subscripted before Python 3.9
+    if isinstance(field_type, inspect.Metadata):
+        return _to_python_type(field_type.type)
+
+    python_type = PYTHON_TYPES.get(type(field_type))
+    if python_type is not None:
+        return python_type
+
+    if isinstance(field_type, inspect.LiteralType):
+        return Literal[field_type.values]
+
+    if isinstance(field_type, (inspect.StructType, inspect.TypedDictType)):
+        return field_type.cls
+
+    if isinstance(field_type, inspect.ListType):
+        return List[_to_python_type(field_type.item_type)]  # type: ignore[misc]
+
+    if isinstance(field_type, inspect.SetType):
+        return Set[_to_python_type(field_type.item_type)]  # type: ignore[misc]
+
+    if isinstance(field_type, inspect.FrozenSetType):
+        return FrozenSet[_to_python_type(field_type.item_type)]  # type: ignore[misc]
+
+    if isinstance(field_type, inspect.VarTupleType):
+        return Tuple[_to_python_type(field_type.item_type), ...]  # type: ignore[misc]
+
+    if isinstance(field_type, inspect.TupleType):
+        return Tuple[tuple(_to_python_type(item_type) for item_type in field_type.item_types)]  # type: ignore[misc]
+
+    if isinstance(field_type, inspect.DictType):
+        return Dict[_to_python_type(field_type.key_type), _to_python_type(field_type.value_type)]  # type: ignore[misc]
+
+    if isinstance(field_type, inspect.UnionType):
+        return Union[tuple(_to_python_type(item_type) for item_type in field_type.types)]
+
+    raise TypeError(field_type)
+
+
 def _set_typed_dict(settings: dict[str, Any], field_type: inspect.Type) -> None:
     assert isinstance(field_type, inspect.TypedDictType)  # noqa: S101
 
-    keys: list[str] = []
+    converters: dict[str, click.ParamType] = {}
+    required_keys: list[str] = []
     for field in field_type.fields:
         name = field.encode_name
-        if not isinstance(field.type, (inspect.StrType, inspect.AnyType)):
-            message = f'key `{name}` must have a `str` value type'
+        ftype = field.type.type if isinstance(field.type, inspect.Metadata) else field.type
+        if isinstance(ftype, (inspect.StrType, inspect.AnyType)):
+            converters[name] = click.STRING
+        elif isinstance(ftype, inspect.IntType):
+            converters[name] = click.INT
+        elif isinstance(ftype, inspect.FloatType):
+            converters[name] = click.FLOAT
+        elif isinstance(ftype, inspect.BoolType):
+            converters[name] = click.BOOL
+        elif isinstance(ftype, inspect.LiteralType) and all(isinstance(value, str) for value in ftype.values):
+            converters[name] = click.Choice([str(value) for value in ftype.values])
+        else:
+            message = f'type of value for key `{name}` is unsupported: {type(ftype)}'
             raise TypeError(message)
 
-        keys.append(name)
+        if field.required:
+            required_keys.append(name)
 
-    settings['cls'] = DictOption
-    settings['type'] = click.Tuple([click.Choice(keys), click.STRING])
+    settings['cls'] = TypedDictOption
+    settings['converters'] = converters
+    settings['required_keys'] = required_keys
+    settings['type'] = click.Tuple([click.Choice(list(converters)), click.STRING])
     settings['multiple'] = True
 
 
@@ -249,25 +969,318 @@ def _set_literal(settings: dict[str, Any], field_type: inspect.Type) -> None:
     settings['type'] = click.Choice(tuple(choices))
 
 
+def _set_argument(settings: dict[str, Any]) -> None:
+    if settings.pop('is_flag', False):
+        message = 'flags cannot be positional arguments'
+        raise TypeError(message)
+
+    option_class = settings.pop('cls', click.Option)
+    if option_class in {DictOption, MappingOption, TypedDictOption}:
+        message = 'mappings cannot be positional arguments'
+        raise TypeError(message)
+
+    # Arguments are not displayed with help text
+    settings.pop('help', None)
+    if settings.pop('multiple', False):
+        settings['nargs'] = -1
+
+    settings['cls'] = ListArgument if option_class in {ListOption, SetOption} else click.Argument
+
+
+class LazyValue:
+    """
+    A value from the command line that has not yet been converted by its option.
+    """
+
+    __slots__ = ('__ctx', '__param', '__value')
+
+    def __init__(self, param: click.Parameter, ctx: click.Context, value: Any) -> None:
+        self.__param = param
+        self.__ctx = ctx
+        self.__value = value
+
+    @property
+    def raw(self) -> Any:
+        """The raw value from the command line, environment variable or default."""
+        return self.__value
+
+    def resolve(self) -> Any:
+        """
+        Returns:
+            The value converted by the option.
+        """
+        return super(_LazyParameterMixin, self.__param).type_cast_value(self.__ctx, self.__value)  # type: ignore[misc]
+
+    def __repr__(self) -> str:
+        return f'LazyValue({self.__value!r})'
+
+
+class _LazyParameterMixin(click.Parameter):
+    def type_cast_value(self, ctx: click.Context, value: Any) -> Any:
+        if value is None or self.callback is not None:
+            return super().type_cast_value(ctx, value)
+
+        return LazyValue(self, ctx, value)
+
+
+class _FrozenParameterMixin(click.Parameter):
+    def __setattr__(self, name: str, value: Any) -> None:
+        message = f'shared parameter `{self.name}` cannot be modified'
+        raise AttributeError(message)
+
+    def __delattr__(self, name: str) -> None:
+        message = f'shared parameter `{self.name}` cannot be modified'
+        raise AttributeError(message)
+
+
+class BytesParamType(click.ParamType):
+    """
+    Accepts base64, hexadecimal with a `hex:` prefix, a file path with an `@` prefix or `-` for standard input.
+    """
+
+    name = 'bytes'
+
+    def __init__(self, kind: str = 'bytes') -> None:
+        self.kind = kind
+
+    def get_metavar(self, param: click.Parameter) -> str:  # noqa: ARG002, PLR6301
+        return 'BASE64|hex:HEX|@FILE|-'
+
+    def convert(self, value: Any, param: click.Parameter | None, ctx: click.Context | None) -> Any:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return self.__wrap(value)
+
+        if value == '-':
+            return self.__wrap(click.get_binary_stream('stdin').read())
+
+        if value.startswith('@'):
+            try:
+                return self.__read(value[1:])
+            except OSError as e:
+                self.fail(f'cannot read {value[1:]!r}: {e.strerror}', param, ctx)
+
+        if value.startswith('hex:'):
+            try:
+                return self.__wrap(bytes.fromhex(value[4:]))
+            except ValueError:
+                self.fail(f'{value!r} is not valid hexadecimal', param, ctx)
+
+        try:
+            return self.__wrap(base64.b64decode(value, validate=True))
+        except binascii.Error:
+            self.fail(f'{value!r} is not valid base64', param, ctx)
+
+    def __wrap(self, data: bytes | bytearray | memoryview) -> bytes | bytearray | memoryview:
+        if self.kind == 'bytes':
+            return data if isinstance(data, bytes) else bytes(data)
+
+        if self.kind == 'bytearray':
+            return data if isinstance(data, bytearray) else bytearray(data)
+
+        return data if isinstance(data, memoryview) else memoryview(data)
+
+    def __read(self, path: str) -> bytes | bytearray | memoryview:
+        with open(path, 'rb', buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            # Files without a known size, such as pipes, are read in full
+            if not size:
+                return self.__wrap(f.read())
+
+            if self.kind == 'bytes':
+                # The buffer is allocated once based on the size of the file
+                return f.read()
+
+            if self.kind == 'memoryview':
+                # The mapping stays open for as long as the view is referenced
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+            buffer = bytearray(size)
+            with memoryview(buffer) as view:
+                offset = 0
+                while offset < size:
+                    read = f.readinto(view[offset:])
+                    if not read:
+                        break
+
+                    offset += read
+
+            if offset < size:
+                del buffer[offset:]
+
+            return buffer
+
+
 class DictOption(click.Option):
     def type_cast_value(self, ctx: click.Context, value: Any):  # no cov
-        return dict(super().type_cast_value(ctx, value))
+        values = dict(super().type_cast_value(ctx, value))
+        path = _get_source_file(ctx, self)
+        if path is None:
+            return values
+
+        if ctx.get_parameter_source(self.name) is ParameterSource.DEFAULT:  # type: ignore[arg-type]
+            values.clear()
+
+        return MappedPairs(path, self, ctx, values)
+
+    def value_is_missing(self, value: Any) -> bool:
+        return value == {} or super().value_is_missing(value)
+
+
+class MappingOption(click.Option):
+    def __init__(self, *args: Any, mapping_type: Any, json_values: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.mapping_type = mapping_type
+        self.json_values = json_values
+
+    def type_cast_value(self, ctx: click.Context, value: Any):  # no cov
+        # Pairs are collected as they are and then converted at once
+        pairs = super().type_cast_value(ctx, value)
+        try:
+            if self.json_values:
+                decode = json.decode
+                raw = {key: decode(item) for key, item in pairs}
+            else:
+                raw = dict(pairs)
+
+            return convert(raw, self.mapping_type, strict=False)
+        except (msgspec.DecodeError, msgspec.ValidationError) as e:
+            raise click.BadParameter(str(e), ctx=ctx, param=self) from None
+
+    def value_is_missing(self, value: Any) -> bool:
+        return value == {} or super().value_is_missing(value)
+
+
+class TypedDictOption(click.Option):
+    def __init__(
+        self,
+        *args: Any,
+        converters: dict[str, click.ParamType],
+        required_keys: list[str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.converters = converters
+        self.required_keys = required_keys or []
+
+    def type_cast_value(self, ctx: click.Context, value: Any):  # no cov
+        # Keys were validated by the choice so the converter of each value is a single lookup
+        converters = self.converters
+        values = {key: converters[key].convert(item, self, ctx) for key, item in super().type_cast_value(ctx, value)}
+        if values:
+            missing = [key for key in self.required_keys if key not in values]
+            if missing:
+                message = f'missing required keys: {", ".join(missing)}'
+                raise click.BadParameter(message, ctx=ctx, param=self)
+
+        return values
+
+    def value_is_missing(self, value: Any) -> bool:
+        return value == {} or super().value_is_missing(value)
 
 
 class ListOption(click.Option):
+    def type_cast_value(self, ctx: click.Context, value: Any):  # no cov
+        values = list(super().type_cast_value(ctx, value))
+        path = _get_source_file(ctx, self)
+        if path is None:
+            return values
+
+        if ctx.get_parameter_source(self.name) is ParameterSource.DEFAULT:  # type: ignore[arg-type]
+            values.clear()
+
+        return MappedLines(path, self, ctx, values)
+
+    def value_is_missing(self, value: Any) -> bool:
+        return value == [] or super().value_is_missing(value)
+
+
+class SetOption(click.Option):
+    def type_cast_value(self, ctx: click.Context, value: Any):  # no cov
+        if not self.multiple or self.nargs != 1 or value is None:
+            return set(super().type_cast_value(ctx, value) or ())
+
+        # Values are converted straight into the set rather than through intermediate sequences
+        convert = self.type.convert
+        return {convert(item, self, ctx) for item in value}
+
+    def value_is_missing(self, value: Any) -> bool:
+        return value == set() or super().value_is_missing(value)
+
+
+class ListArgument(click.Argument):
     def type_cast_value(self, ctx: click.Context, value: Any):  # no cov
         return list(super().type_cast_value(ctx, value))
 
 
+PRIMITIVE_TYPES = (inspect.StrType, inspect.AnyType, inspect.IntType, inspect.FloatType, inspect.BoolType)
+
+# Types of dictionary values that cannot be represented by a single string
+JSON_VALUE_TYPES = (
+    inspect.DictType,
+    inspect.FrozenSetType,
+    inspect.ListType,
+    inspect.SetType,
+    inspect.StructType,
+    inspect.TupleType,
+    inspect.TypedDictType,
+    inspect.VarTupleType,
+)
+
+PYTHON_TYPES: dict[type[inspect.Type], Any] = {
+    inspect.AnyType: Any,
+    inspect.BoolType: bool,
+    inspect.BytesType: bytes,
+    inspect.FloatType: float,
+    inspect.IntType: int,
+    inspect.NoneType: type(None),
+    inspect.StrType: str,
+}
+
+BYTES_KINDS: dict[type[inspect.Type], str] = {
+    inspect.ByteArrayType: 'bytearray',
+    inspect.BytesType: 'bytes',
+    inspect.MemoryViewType: 'memoryview',
+}
+
 SETTERS: dict[type[inspect.Type], Callable[[dict[str, Any], inspect.Type], None]] = {
     inspect.BoolType: _set_bool,
+    inspect.ByteArrayType: _set_bytes,
+    inspect.BytesType: _set_bytes,
     inspect.DictType: _set_dict,
     inspect.FloatType: _set_float,
+    inspect.FrozenSetType: _set_set,
     inspect.IntType: _set_int,
     inspect.ListType: _set_list,
     inspect.LiteralType: _set_literal,
+    inspect.MemoryViewType: _set_bytes,
+    inspect.SetType: _set_set,
     inspect.StrType: _set_str,
     inspect.TupleType: _set_tuple,
     inspect.TypedDictType: _set_typed_dict,
     inspect.VarTupleType: _set_var_tuple,
 }
+
+# Guards writes to the caches below, which may be read without it
+_LOCK = threading.Lock()
+
+# Generated specs per type and built-in naming, which allows subclasses to only process fields that are new or
+# overridden
+_SPECS: WeakKeyDictionary[type, dict[str, dict[str, tuple[inspect.Field, OptionSpec]]]] = WeakKeyDictionary()
+
+# The names of the parameters of fields per type, keyed by the names of the fields
+_PARAM_NAMES: WeakKeyDictionary[type, dict[str, str]] = WeakKeyDictionary()
+
+# The encoded names of fields per type, keyed by the names of their parameters if those differ
+_ENCODE_NAMES: WeakKeyDictionary[type, dict[str, str]] = WeakKeyDictionary()
+
+# Parameters that are shared by every caller, which are only kept alive by the commands using them
+_SHARED_PARAMS: WeakValueDictionary[tuple[OptionSpec, bool], click.Parameter] = WeakValueDictionary()
+
+# Subclasses of parameter classes that defer conversion
+_LAZY_CLASSES: dict[type[click.Parameter], type[click.Parameter]] = {}
+
+# Subclasses of parameter classes that reject modifications of shared instances
+_FROZEN_CLASSES: dict[type[click.Parameter], type[click.Parameter]] = {}
+
+# Attribute docstrings per type, which requires parsing the source code
+_DOCSTRINGS: WeakKeyDictionary[type, dict[str, str]] = WeakKeyDictionary()
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import mmap
+import os
+from typing import TYPE_CHECKING, Any
+
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# The byte value of a carriage return, which is stripped from the end of lines
+CARRIAGE_RETURN = 13
+
+
+class MappedLines:
+    """
+    The values of a [`list`][] field that were read from a file passed to its `--<field>-from-file` option, one
+    value per line. The file is memory-mapped and each line is only decoded and converted when iterated, so the
+    size of the file does not affect memory usage. Empty lines are skipped and values that were also passed to
+    the option itself come first.
+
+    Conversion errors are raised as [click.BadParameter][] while iterating.
+    """
+
+    __slots__ = ('__ctx', '__param', '__path', '__values')
+
+    def __init__(self, path: str, param: click.Parameter, ctx: click.Context, values: list[Any]) -> None:
+        self.__path = path
+        self.__param = param
+        self.__ctx = ctx
+        self.__values = values
+
+    @property
+    def path(self) -> str:
+        """The path to the file."""
+        return self.__path
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self.__values
+
+        convert = self.__param.type.convert
+        for _, line in _iter_lines(self.__path):
+            yield convert(line, self.__param, self.__ctx)
+
+    def to_list(self) -> list[Any]:
+        """
+        Returns:
+            Every value, which requires reading the entire file.
+        """
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f'MappedLines({self.__path!r})'
+
+
+class MappedPairs:
+    """
+    The values of a [`dict`][] field that were read from a file passed to its `--<field>-from-file` option, one
+    `key=value` pair per line. Like [MappedLines][msgspec_click.MappedLines], pairs are only decoded and converted
+    when iterated and those that were also passed to the option itself come first. Later pairs take precedence
+    when [converted][msgspec_click.MappedPairs.to_dict] to a dictionary.
+    """
+
+    __slots__ = ('__ctx', '__param', '__path', '__values')
+
+    def __init__(self, path: str, param: click.Parameter, ctx: click.Context, values: dict[str, Any]) -> None:
+        self.__path = path
+        self.__param = param
+        self.__ctx = ctx
+        self.__values = values
+
+    @property
+    def path(self) -> str:
+        """The path to the file."""
+        return self.__path
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """
+        Returns:
+            An iterator of key-value pairs.
+        """
+        yield from self.__values.items()
+
+        convert = self.__param.type.convert
+        for number, line in _iter_lines(self.__path):
+            key, separator, value = line.partition('=')
+            if not separator:
+                message = f'line #{number} of {self.__path} is not a `key=value` pair'
+                raise click.BadParameter(message, ctx=self.__ctx, param=self.__param)
+
+            yield convert((key, value), self.__param, self.__ctx)
+
+    def keys(self) -> Iterator[str]:
+        """
+        Returns:
+            An iterator of keys, which may repeat.
+        """
+        return (key for key, _ in self.items())
+
+    def values(self) -> Iterator[Any]:
+        """
+        Returns:
+            An iterator of values.
+        """
+        return (value for _, value in self.items())
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns:
+            Every pair, which requires reading the entire file.
+        """
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f'MappedPairs({self.__path!r})'
+
+
+def _iter_lines(path: str) -> Iterator[tuple[int, str]]:
+    with open(path, 'rb') as f:
+        # Empty files cannot be mapped
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            number = 0
+            start = 0
+            while start < size:
+                number += 1
+                end = mapped.find(b'\n', start)
+                if end == -1:
+                    end = size
+
+                stop = end - 1 if end > start and view[end - 1] == CARRIAGE_RETURN else end
+                if stop > start:
+                    # Strings are decoded directly from the mapped memory without intermediate copies
+                    yield number, str(view[start:stop], 'utf-8')
+
+                start = end + 1
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import Any
+
+from msgspec_click._core import LazyValue, _get_param_names, _to_instance
+
+
+class LazyStruct:
+    """
+    A proxy for an instance of a type whose fields are only converted when accessed. This is meant to be used
+    with the values produced by options that were [generated][msgspec_click.generate_options] with `lazy=True`:
+
+    ```python
+    @click.command()
+    def command(**kwargs) -> None:
+        config = LazyStruct(Config, kwargs)
+        if config.dry_run:
+            return
+    ```
+
+    Attributes return the values as converted by the options. Call
+    [`to_struct`][msgspec_click.LazyStruct.to_struct] to convert every field and validate the result.
+
+    Parameters:
+        struct: The type with which the options were generated.
+        values: The parsed values of a command, such as those passed to its callback.
+    """
+
+    __slots__ = ('__names', '__struct', '__values')
+
+    def __init__(self, struct: type, values: dict[str, Any]) -> None:
+        self.__struct = struct
+        self.__values = dict(values)
+        self.__names = _get_param_names(struct)
+
+    def __getattr__(self, name: str) -> Any:
+        param_name = self.__names.get(name)
+        if param_name is None or param_name not in self.__values:
+            message = f'{self.__struct.__name__!r} object has no field {name!r}'
+            raise AttributeError(message)
+
+        return self.__resolve(param_name)
+
+    def to_struct(self) -> Any:
+        """
+        Returns:
+            An instance of the type with every field converted.
+        """
+        for param_name in self.__values:
+            self.__resolve(param_name)
+
+        return _to_instance(self.__struct, self.__values)
+
+    def __resolve(self, param_name: str) -> Any:
+        value = self.__values[param_name]
+        if isinstance(value, LazyValue):
+            value = self.__values[param_name] = value.resolve()
+
+        return value
+
+    def __repr__(self) -> str:
+        return f'LazyStruct({self.__struct.__name__})'
@@ -0,0 +1,223 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary
+
+from msgspec import NODEFAULT, inspect, json
+
+from msgspec_click._core import (
+    _LOCK,
+    SUPPORTED_UNION_LENGTH,
+    _check_collisions,
+    _generate_spec,
+    _get_docstrings,
+    _get_specs,
+)
+
+if TYPE_CHECKING:
+    from msgspec_click._core import Naming, OptionSpec
+
+
+def generate_schema(struct: type) -> dict[str, Any]:
+    """
+    Generates the JSON schema of a type, as produced by [msgspec.json.schema][], that also describes its
+    options. Missing descriptions of properties are taken from attribute docstrings, and metadata in the
+    `extra` dictionary that can be encoded as JSON is kept under the `x-click` key of each property so that
+    passing the schema to [`generate_options`][msgspec_click.generate_options] produces the same options.
+
+    Parameters:
+        struct: The [msgspec.Struct][], dataclass or attrs type with which to generate the schema.
+
+    Returns:
+        A new dictionary representing the JSON schema.
+    """
+    encoded = _SCHEMAS.get(struct)
+    if encoded is None:
+        encoded = _generate_schema(struct)
+        with _LOCK:
+            encoded = _SCHEMAS.setdefault(struct, encoded)
+
+    return json.decode(encoded)
+
+
+def _generate_schema(struct: type) -> bytes:
+    schema = json.schema(struct)
+    definition = _resolve_ref(schema, schema)
+    if 'properties' not in definition:
+        message = f'Type `{struct.__name__}` is encoded as an array, so its fields have no properties'
+        raise TypeError(message)
+
+    properties = definition['properties']
+    docstrings = _get_docstrings(struct)
+    for field, _ in _get_specs(struct).values():
+        prop = properties[field.encode_name]
+        if 'description' not in prop and field.name in docstrings:
+            prop['description'] = docstrings[field.name]
+
+        if isinstance(field.type, inspect.Metadata) and field.type.extra:
+            # Values such as callbacks and classes only exist at runtime
+            extra: dict[str, Any] = {}
+            for key, value in field.type.extra.items():
+                try:
+                    json.encode(value)
+                except TypeError:
+                    continue
+
+                extra[key] = value
+
+            if extra:
+                prop['x-click'] = extra
+
+    return json.encode(schema)
+
+
+def _get_schema_specs(schema: dict[str, Any], naming: Naming = 'kebab') -> dict[str, tuple[inspect.Field, OptionSpec]]:
+    # Schemas are not hashable so their encoding is used as the key, which also preserves the order of properties
+    return _compile_schema(json.encode(schema), naming)
+
+
+@lru_cache(maxsize=256)
+def _compile_schema(encoded: bytes, naming: Naming) -> dict[str, tuple[inspect.Field, OptionSpec]]:
+    schema = json.decode(encoded)
+    root = _resolve_ref(schema, schema)
+    if root.get('type') != 'object' or 'properties' not in root:
+        message = 'The JSON schema must describe an object with properties'
+        raise TypeError(message)
+
+    required = set(root.get('required', ()))
+    specs: dict[str, tuple[inspect.Field, OptionSpec]] = {}
+    for name, prop in root['properties'].items():
+        field = _schema_to_field(name, prop, schema, required=name in required)
+        specs[name] = (field, _generate_spec(field, None, naming))
+
+    _check_collisions(specs)
+    return specs
+
+
+def _schema_to_field(name: str, prop: dict[str, Any], schema: dict[str, Any], *, required: bool) -> inspect.Field:
+    try:
+        field_type = _schema_to_type(prop, schema)
+    except TypeError:
+        message = f'Unsupported JSON schema for field `{name}`: {prop}'
+        raise TypeError(message) from None
+
+    # Mutable defaults are emitted for fields with a default factory, which options do not need
+    default = prop.get('default', NODEFAULT)
+    default_factory: Any = NODEFAULT
+    if default in ([], {}):
+        default, default_factory = NODEFAULT, type(default)
+    elif isinstance(default, list) and isinstance(field_type, (inspect.TupleType, inspect.VarTupleType)):
+        default = tuple(default)
+
+    # The title of referenced definitions is the name of their type, which is not meant as help text
+    extra_json_schema = {key: prop[key] for key in ('title', 'description') if key in prop}
+    extra = prop.get('x-click')
+    if extra_json_schema or extra:
+        field_type = inspect.Metadata(type=field_type, extra_json_schema=extra_json_schema or None, extra=extra or None)
+
+    return inspect.Field(
+        name=name,
+        encode_name=name,
+        type=field_type,
+        required=required,
+        default=default,
+        default_factory=default_factory,
+    )
+
+
+def _schema_to_type(prop: dict[str, Any], schema: dict[str, Any]) -> inspect.Type:
+    prop = _resolve_ref(prop, schema)
+    if 'anyOf' in prop:
+        types = [_resolve_ref(item, schema) for item in prop['anyOf']]
+        if len(types) != SUPPORTED_UNION_LENGTH or types[1].get('type') != 'null':
+            raise TypeError
+
+        return inspect.UnionType(types=(_schema_to_type(types[0], schema), inspect.NoneType()))
+
+    if 'enum' in prop:
+        return inspect.LiteralType(values=tuple(prop['enum']))
+
+    schema_type = prop.get('type')
+    if schema_type == 'string' and prop.get('contentEncoding') == 'base64':
+        return inspect.BytesType(min_length=prop.get('minLength'), max_length=prop.get('maxLength'))
+
+    if schema_type == 'string':
+        return inspect.StrType(
+            min_length=prop.get('minLength'), max_length=prop.get('maxLength'), pattern=prop.get('pattern')
+        )
+
+    if schema_type in {'integer', 'number'}:
+        number_type = inspect.IntType if schema_type == 'integer' else inspect.FloatType
+        return number_type(
+            gt=prop.get('exclusiveMinimum'),
+            ge=prop.get('minimum'),
+            lt=prop.get('exclusiveMaximum'),
+            le=prop.get('maximum'),
+            multiple_of=prop.get('multipleOf'),
+        )
+
+    if schema_type == 'boolean':
+        return inspect.BoolType()
+
+    if schema_type == 'array':
+        if 'prefixItems' in prop:
+            return inspect.TupleType(item_types=tuple(_schema_to_type(item, schema) for item in prop['prefixItems']))
+
+        array_type = inspect.SetType if prop.get('uniqueItems', False) else inspect.ListType
+        return array_type(
+            item_type=_schema_to_type(prop.get('items', {}), schema),
+            min_length=prop.get('minItems'),
+            max_length=prop.get('maxItems'),
+        )
+
+    if schema_type == 'object':
+        if 'properties' in prop:
+            required = set(prop.get('required', ()))
+            return inspect.TypedDictType(
+                cls=dict,
+                fields=tuple(
+                    inspect.Field(
+                        name=key,
+                        encode_name=key,
+                        type=_schema_to_type(value, schema),
+                        required=key in required,
+                        default=NODEFAULT,
+                        default_factory=NODEFAULT,
+                    )
+                    for key, value in prop['properties'].items()
+                ),
+            )
+
+        return inspect.DictType(
+            key_type=inspect.StrType(),
+            value_type=_schema_to_type(prop.get('additionalProperties', {}), schema),
+            min_length=prop.get('minProperties'),
+            max_length=prop.get('maxProperties'),
+        )
+
+    if not prop:
+        return inspect.AnyType()
+
+    raise TypeError
+
+
+def _resolve_ref(prop: dict[str, Any], schema: dict[str, Any]) -> dict[str, Any]:
+    ref = prop.get('$ref')
+    if ref is None:
+        return prop
+
+    # References are pointers from the root of the schema such as `#/$defs/Config`, and `str.removeprefix` is not
+    # available on Python 3.8
+    target: Any = schema
+    for part in (ref[2:] if ref.startswith('#/') else ref).split('/'):
+        target = target[part]
+
+    return target
+
+
+# Encoded JSON schemas per type, which are decoded for every caller since dictionaries are mutable
+_SCHEMAS: WeakKeyDictionary[type, bytes] = WeakKeyDictionary()
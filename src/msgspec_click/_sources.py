@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+import click
+from click.core import ParameterSource
+
+from msgspec_click._core import _LOCK, _get_param_names
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# The key of the context metadata that maps contexts and types to the sources of their fields
+FIELD_SOURCES_KEY = 'msgspec_click.field_sources'
+
+# Sources indexed by their value, where zero means that the source is unknown
+SOURCES: tuple[ParameterSource | None, ...] = (None, *sorted(ParameterSource, key=lambda source: source.value))
+
+
+class FieldSources:
+    """
+    Where the value of each field of a type came from during an invocation, as returned by
+    [`collect_sources`][msgspec_click.collect_sources]. Sources are stored as a single byte per field rather
+    than alongside the values, so they may be kept next to the converted instance at no cost to the values:
+
+    ```python
+    config = convert(kwargs, Config)
+    sources = collect_sources(Config)
+    if sources['timeout'] is ParameterSource.DEFAULT:
+        ...
+    ```
+    """
+
+    __slots__ = ('__bitmap', '__positions')
+
+    def __init__(self, positions: dict[str, int], bitmap: bytes) -> None:
+        self.__positions = positions
+        self.__bitmap = bitmap
+
+    @property
+    def bitmap(self) -> bytes:
+        """
+        The value of the [source][click.core.ParameterSource] of each field in the order of the fields, or zero
+        if the source is unknown, such as when the parameter of the field was not processed.
+        """
+        return self.__bitmap
+
+    def __getitem__(self, name: str) -> ParameterSource | None:
+        return SOURCES[self.__bitmap[self.__positions[name]]]
+
+    def __len__(self) -> int:
+        return len(self.__bitmap)
+
+    def items(self) -> Iterator[tuple[str, ParameterSource | None]]:
+        """
+        Returns:
+            An iterator of field names and their sources, in the order of the fields.
+        """
+        bitmap = self.__bitmap
+        return ((name, SOURCES[bitmap[position]]) for name, position in self.__positions.items())
+
+    def fields(self, *sources: ParameterSource) -> list[str]:
+        """
+        Parameters:
+            sources: The sources to look for.
+
+        Returns:
+            The names of fields whose values came from any of the sources, in the order of the fields.
+        """
+        values = {source.value for source in sources}
+        bitmap = self.__bitmap
+        return [name for name, position in self.__positions.items() if bitmap[position] in values]
+
+    def __repr__(self) -> str:
+        sources = ', '.join(f'{name}={source.name if source else None}' for name, source in self.items())
+        return f'FieldSources({sources})'
+
+
+def collect_sources(struct: type, ctx: click.Context | None = None) -> FieldSources:
+    """
+    Collects the [source][click.core.ParameterSource] of the value of every field, e.g. whether it was passed
+    on the command line, set by an environment variable, prompted for or left as the default. The sources are
+    collected once per invocation and every subsequent call returns the same instance.
+
+    Parameters:
+        struct: The type with which the options of the command were generated.
+        ctx: The context of the invocation, defaulting to the
+            [current context][click.get_current_context].
+
+    Returns:
+        A [FieldSources][msgspec_click.FieldSources] instance.
+    """
+    if ctx is None:
+        ctx = click.get_current_context()
+
+    # Metadata is shared by every context of the invocation, such as those of a group and its subcommand
+    collected = ctx.meta.setdefault(FIELD_SOURCES_KEY, {})
+    key = (ctx, struct)
+    sources = collected.get(key)
+    if sources is None:
+        positions, param_names = _get_layout(struct)
+        bitmap = bytes(_get_source_value(ctx, name) for name in param_names)
+        sources = collected[key] = FieldSources(positions, bitmap)
+
+    return sources
+
+
+def _get_source_value(ctx: click.Context, name: str) -> int:
+    source = ctx.get_parameter_source(name)
+    return 0 if source is None else source.value
+
+
+def _get_layout(struct: type) -> tuple[dict[str, int], tuple[str, ...]]:
+    layout = _LAYOUTS.get(struct)
+    if layout is None:
+        param_names = _get_param_names(struct)
+        layout = ({name: position for position, name in enumerate(param_names)}, tuple(param_names.values()))
+        with _LOCK:
+            layout = _LAYOUTS.setdefault(struct, layout)
+
+    return layout
+
+
+# The position of every field by name and the names of their parameters per type
+_LAYOUTS: WeakKeyDictionary[type, tuple[dict[str, int], tuple[str, ...]]] = WeakKeyDictionary()
@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from functools import lru_cache
+from inspect import Parameter, signature
+from typing import TYPE_CHECKING, Literal
+
+import click
+from msgspec import Struct, inspect
+
+from msgspec_click._core import _generate_spec, _get_fields, _iter_flags
+
+if TYPE_CHECKING:
+    from msgspec_click._core import Naming
+
+# Keys of metadata that are consumed by option generation rather than passed to the option class
+GENERATION_KEYS = frozenset({'aliases', 'argument', 'cls', 'params'})
+
+
+class FieldIssue(Struct, frozen=True, gc=False):
+    """
+    A problem with a field that prevents generating a working option for it.
+    """
+
+    field: str
+    """The name of the field."""
+    kind: Literal['unsupported', 'conflict', 'unknown-key']
+    """
+    The kind of problem, either `unsupported` for fields whose options cannot be generated, `conflict` for
+    flags that are used by more than one field, or `unknown-key` for keys in the `extra` dictionary of the
+    metadata that the option class does not accept.
+    """
+    message: str
+    """A description of the problem."""
+
+
+def validate_struct(struct: type, *, naming: Naming = 'kebab') -> list[FieldIssue]:
+    """
+    Checks every field of a type in a single pass rather than stopping at the first error like
+    [`generate_options`][msgspec_click.generate_options] does. Options are never constructed, so this is cheap
+    to run over many types, such as in a pre-commit hook:
+
+    ```python
+    for struct in registry:
+        for issue in validate_struct(struct):
+            print(f'{struct.__name__}.{issue.field}: {issue.message}')
+    ```
+
+    Parameters:
+        struct: The [msgspec.Struct][], dataclass, attrs or NamedTuple type to validate.
+        naming: How flags are derived from the names of fields, see
+            [`generate_options`][msgspec_click.generate_options].
+
+    Returns:
+        A list of [FieldIssue][msgspec_click.FieldIssue] instances in the order of the fields, which is empty if
+        options may be generated for every field.
+    """
+    issues: list[FieldIssue] = []
+    flags: dict[str, str] = {}
+    for field in _get_fields(struct):
+        extra = field.type.extra if isinstance(field.type, inspect.Metadata) else None
+        if extra:
+            default_class = click.Argument if extra.get('argument', False) else click.Option
+            param_class = extra.get('cls', default_class)
+            accepted = _get_accepted_keys(param_class) if isinstance(param_class, type) else None
+            if accepted is not None:
+                issues.extend(
+                    FieldIssue(
+                        field=field.name,
+                        kind='unknown-key',
+                        message=f'Unknown key `{key}` for `{param_class.__name__}`',
+                    )
+                    for key in extra
+                    if key not in accepted and key not in GENERATION_KEYS
+                )
+
+        try:
+            spec = _generate_spec(field, struct, naming)
+        except TypeError as e:
+            issues.append(FieldIssue(field=field.name, kind='unsupported', message=str(e)))
+            continue
+
+        for flag in dict.fromkeys([*_iter_flags(spec), spec.name]):
+            other = flags.setdefault(flag, field.name)
+            if other != field.name:
+                issues.append(
+                    FieldIssue(
+                        field=field.name,
+                        kind='conflict',
+                        message=f'`{flag}` is already used by field `{other}`',
+                    )
+                )
+
+    return issues
+
+
+@lru_cache(maxsize=None)
+def _get_accepted_keys(param_class: type) -> frozenset[str] | None:
+    # Keyword arguments are forwarded up the hierarchy until a constructor without `**kwargs` is found
+    keys: set[str] = set()
+    for cls in param_class.__mro__:
+        if cls is object:
+            break
+
+        init = cls.__dict__.get('__init__')
+        if init is None:
+            continue
+
+        try:
+            parameters = signature(init).parameters.values()
+        except (TypeError, ValueError):
+            return None
+
+        keys.update(p.name for p in parameters if p.kind in {Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY})
+        if all(p.kind != Parameter.VAR_KEYWORD for p in parameters):
+            break
+
+    # Arguments are not displayed with help text, which is discarded
+    keys.add('help')
+    keys.difference_update({'self', 'param_decls'})
+    return frozenset(keys)
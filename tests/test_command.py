@@ -0,0 +1,664 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated, Any
+
+import click
+import msgspec
+import pytest
+from click.core import ParameterSource
+from click.testing import CliRunner
+from msgspec import Meta, Struct, convert
+
+from msgspec_click import StructCommand
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class Connection(Struct):
+    host: str
+    port: int = 80
+    headers: Annotated[list[str], Meta(extra={'params': ['-H']})] = []
+
+
+class Credentials(Struct):
+    user: Annotated[str, Meta(extra={'prompt': True})]
+    password: Annotated[str, Meta(extra={'prompt': True, 'hide_input': True})]
+    pin: Annotated[int, Meta(extra={'prompt': True})] = 0
+    port: int = 80
+
+
+PROCESSED: list[str] = []
+RECORD = Meta(extra={'callback': lambda ctx, param, value: PROCESSED.append(param.name)})  # noqa: ARG005
+
+
+CALLED: list[Any] = []
+
+
+def suffix(ctx: click.Context, param: click.Parameter, value: Any) -> Any:  # noqa: ARG001
+    CALLED.append(value)
+    return f'{value}!' if isinstance(value, str) else value
+
+
+class Confirmed(Struct):
+    token: Annotated[str, Meta(extra={'prompt': True, 'callback': suffix})]
+    confirm: Annotated[bool, Meta(extra={'prompt': True, 'callback': suffix})] = False
+
+
+class Acknowledged(Struct):
+    name: str = ''
+    acknowledged: Annotated[str, Meta(extra={'prompt': True, 'expose_value': False, 'callback': suffix})] = ''
+
+
+class Ordered(Struct):
+    first: Annotated[str, RECORD] = ''
+    second: Annotated[str, RECORD] = ''
+    third: Annotated[str, RECORD] = ''
+
+
+def make_command(**kwargs: Any) -> StructCommand:
+    def callback(**values: Any) -> Connection:
+        return convert(values, Connection)
+
+    return StructCommand('command', callback=callback, struct=Connection, **kwargs)
+
+
+class TestOptions:
+    def test_generated(self) -> None:
+        command = make_command()
+        assert [param.opts for param in command.params] == [['--host'], ['--port'], ['-H']]
+        assert command.main(['--host', 'foo'], standalone_mode=False) == Connection(host='foo')
+
+    def test_decorator(self) -> None:
+        @click.command(cls=StructCommand, struct=Connection)
+        @click.option('--extra', is_flag=True)
+        def command(*, extra: bool, **kwargs: Any) -> tuple[bool, Connection]:
+            return extra, convert(kwargs, Connection)
+
+        assert command.main(['--extra', '--host', 'foo', '--port', '8080'], standalone_mode=False) == (
+            True,
+            Connection(host='foo', port=8080),
+        )
+
+    def test_required(self) -> None:
+        result = CliRunner().invoke(make_command(), [])
+        assert result.exit_code == 2
+        assert "Missing option '--host'" in result.output
+
+
+class TestBatch:
+    def test_json(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo"}\n\n{"host": "bar", "port": 8080}\n{"headers": ["a"]}\n')
+
+        command = make_command(batch=True)
+        result = command.main(['--host', 'baz', '-H', 'b', '--batch', str(batch_file)], standalone_mode=False)
+        assert result == [
+            Connection(host='foo', headers=['b']),
+            Connection(host='bar', port=8080, headers=['b']),
+            Connection(host='baz', headers=['a']),
+        ]
+
+    def test_from_file(self, tmp_path: Path) -> None:
+        headers_file = tmp_path / 'headers.txt'
+        headers_file.write_text('a\nb\n')
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo"}\n{"host": "bar", "headers": ["c"]}\n')
+
+        command = make_command(batch=True, from_file=True)
+        result = command.main(
+            ['--headers-from-file', str(headers_file), '--batch', str(batch_file)], standalone_mode=False
+        )
+        assert result == [Connection(host='foo', headers=['a', 'b']), Connection(host='bar', headers=['c'])]
+
+    def test_msgpack(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.msgpack'
+        batch_file.write_bytes(msgspec.msgpack.encode([{'host': 'foo'}, {'host': 'bar', 'port': 8080}]))
+
+        command = make_command(batch=True)
+        result = command.main(['--batch', str(batch_file), '--batch-format', 'msgpack'], standalone_mode=False)
+        assert result == [Connection(host='foo'), Connection(host='bar', port=8080)]
+
+    def test_stdin(self) -> None:
+        result = CliRunner().invoke(
+            make_command(batch=True), ['--batch', '-'], input='{"host": "foo"}\n', standalone_mode=False
+        )
+        assert result.exit_code == 0, result.output
+        assert result.return_value == [Connection(host='foo')]
+
+    def test_no_batch(self) -> None:
+        command = make_command(batch=True)
+        assert command.main(['--host', 'foo'], standalone_mode=False) == Connection(host='foo')
+
+    def test_no_batch_required(self) -> None:
+        result = CliRunner().invoke(make_command(batch=True), [])
+        assert result.exit_code == 2
+        assert "Missing option '--host'" in result.output
+
+    def test_record_required(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo"}\n{"port": 8080}\n')
+
+        result = CliRunner().invoke(make_command(batch=True), ['--batch', str(batch_file)])
+        assert result.exit_code == 2
+        assert 'record #2 is missing required fields: host' in result.output
+
+    def test_record_converted(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo", "port": "8080"}\n')
+
+        command = StructCommand('command', struct=Connection, batch=True, callback=lambda **values: values)
+        assert command.main(['--batch', str(batch_file)], standalone_mode=False) == [
+            {'host': 'foo', 'port': 8080, 'headers': []}
+        ]
+
+    def test_record_invalid(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo"}\n{"host": "bar", "port": "x"}\n')
+
+        result = CliRunner().invoke(make_command(batch=True), ['--batch', str(batch_file)])
+        assert result.exit_code == 2
+        assert 'record #2 is invalid: Expected `int`, got `str` - at `$.port`' in result.output
+
+    def test_record_malformed(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo"}\n\n{"host": \n')
+
+        result = CliRunner().invoke(make_command(batch=True), ['--batch', str(batch_file)])
+        assert result.exit_code == 2
+        assert 'record #2 is malformed: Input data was truncated' in result.output
+
+    def test_record_malformed_msgpack(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.msgpack'
+        batch_file.write_bytes(msgspec.msgpack.encode([{'host': 'foo'}, 1]))
+
+        result = CliRunner().invoke(make_command(batch=True), ['--batch', str(batch_file), '--batch-format', 'msgpack'])
+        assert result.exit_code == 2
+        assert 'record #2 is malformed: Expected `object`, got `int`' in result.output
+
+    def test_malformed_msgpack(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.msgpack'
+        batch_file.write_bytes(msgspec.msgpack.encode({'host': 'foo'}))
+
+        result = CliRunner().invoke(make_command(batch=True), ['--batch', str(batch_file), '--batch-format', 'msgpack'])
+        assert result.exit_code == 2
+        assert 'invalid MessagePack array: Expected `array`, got `object`' in result.output
+
+    def test_record_unknown(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo", "foo": 1, "bar": 2}\n')
+
+        result = CliRunner().invoke(make_command(batch=True), ['--batch', str(batch_file)])
+        assert result.exit_code == 2
+        assert 'record #1 has unknown fields: bar, foo' in result.output
+
+    @pytest.mark.parametrize('batch', [False, True])
+    def test_options(self, batch: bool) -> None:  # noqa: FBT001
+        command = make_command(batch=batch)
+        assert ('--batch' in {opt for param in command.params for opt in param.opts}) is batch
+
+
+class TestReplay:
+    def test_round_trip(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv('COMMAND_PORT', '8080')
+        snapshot = tmp_path / 'config.msgpack'
+        command = make_command(replay=True, context_settings={'auto_envvar_prefix': 'COMMAND'})
+        expected = Connection(host='foo', port=8080, headers=['a'])
+        assert command.main(['--host', 'foo', '-H', 'a', '--dump-config', str(snapshot)], standalone_mode=False) == (
+            expected
+        )
+        assert msgspec.msgpack.decode(snapshot.read_bytes()) == {
+            'config': {'host': 'foo', 'port': 8080, 'headers': ['a']},
+            'sources': {'host': 'COMMANDLINE', 'port': 'ENVIRONMENT', 'headers': 'COMMANDLINE'},
+        }
+
+        monkeypatch.delenv('COMMAND_PORT')
+        assert command.main(['--replay', str(snapshot)], standalone_mode=False) == expected
+        assert command.main([f'--replay={snapshot}'], standalone_mode=False) == expected
+
+    def test_sources(self, tmp_path: Path) -> None:
+        snapshot = tmp_path / 'config.msgpack'
+
+        def callback(**_: Any) -> dict[str, Any]:
+            ctx = click.get_current_context()
+            return {name: ctx.get_parameter_source(name) for name in ('host', 'port')}
+
+        command = StructCommand('command', callback=callback, struct=Connection, replay=True)
+        command.main(['--host', 'foo', '--dump-config', str(snapshot)], standalone_mode=False)
+        assert command.main(['--replay', str(snapshot)], standalone_mode=False) == {
+            'host': ParameterSource.COMMANDLINE,
+            'port': ParameterSource.DEFAULT,
+        }
+
+    def test_skips_parsing(self, tmp_path: Path) -> None:
+        snapshot = tmp_path / 'config.msgpack'
+        command = StructCommand('command', struct=Ordered, callback=lambda **_: None, replay=True)
+        snapshot.write_bytes(msgspec.msgpack.encode({'config': {'first': 'x'}, 'sources': {}}))
+        PROCESSED.clear()
+        command.main(['--replay', str(snapshot)], standalone_mode=False)
+        assert PROCESSED == []
+
+    def test_from_file(self, tmp_path: Path) -> None:
+        headers_file = tmp_path / 'headers.txt'
+        headers_file.write_text('a\nb\n')
+        snapshot = tmp_path / 'config.msgpack'
+
+        command = StructCommand(
+            'command', struct=Connection, callback=lambda **values: values, replay=True, from_file=True
+        )
+        command.main(
+            ['--host', 'foo', '--headers-from-file', str(headers_file), '--dump-config', str(snapshot)],
+            standalone_mode=False,
+        )
+
+        headers_file.unlink()
+        assert command.main(['--replay', str(snapshot)], standalone_mode=False) == {
+            'host': 'foo',
+            'port': 80,
+            'headers': ['a', 'b'],
+        }
+
+    def test_other_params(self, tmp_path: Path) -> None:
+        snapshot = tmp_path / 'config.msgpack'
+
+        @click.command(cls=StructCommand, struct=Connection, replay=True)
+        @click.option('--extra', is_flag=True)
+        @click.option('--level', default=3, callback=lambda ctx, param, value: value * 2)  # noqa: ARG005
+        def command(**values: Any) -> dict[str, Any]:
+            return values
+
+        command.main(['--host', 'foo', '--extra', '--dump-config', str(snapshot)], standalone_mode=False)
+        assert command.main(['--replay', str(snapshot)], standalone_mode=False) == {
+            'extra': False,
+            'level': 6,
+            'host': 'foo',
+            'port': 80,
+            'headers': [],
+        }
+
+    def test_hidden_input(self, tmp_path: Path) -> None:
+        snapshot = tmp_path / 'config.msgpack'
+        command = make_credentials_command(replay=True)
+        result = CliRunner().invoke(
+            command,
+            ['--user', 'alice', '--pin', '1', '--dump-config', str(snapshot)],
+            input='secret\n',
+            standalone_mode=False,
+        )
+        assert result.exit_code == 0, result.output
+        assert b'secret' not in snapshot.read_bytes()
+        assert 'password' not in msgspec.msgpack.decode(snapshot.read_bytes())['config']
+
+        result = CliRunner().invoke(command, ['--replay', str(snapshot)], input='other\n', standalone_mode=False)
+        assert result.exit_code == 0, result.output
+        assert result.return_value == Credentials(user='alice', password='other', pin=1)
+
+    def test_combined(self, tmp_path: Path) -> None:
+        snapshot = tmp_path / 'config.msgpack'
+        snapshot.write_bytes(msgspec.msgpack.encode({'config': {'host': 'foo'}, 'sources': {}}))
+
+        result = CliRunner().invoke(make_command(replay=True), ['--replay', str(snapshot), '--port', '1'])
+        assert result.exit_code == 2
+        assert '`--replay` cannot be combined with other options or arguments' in result.output
+
+    def test_invalid(self, tmp_path: Path) -> None:
+        snapshot = tmp_path / 'config.msgpack'
+        snapshot.write_bytes(msgspec.msgpack.encode({'config': {'port': 1}, 'sources': {}}))
+
+        result = CliRunner().invoke(make_command(replay=True), ['--replay', str(snapshot)])
+        assert result.exit_code == 2
+        assert 'invalid snapshot: Object missing required field `host`' in result.output
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(make_command(replay=True), ['--replay', str(tmp_path / 'missing.msgpack')])
+        assert result.exit_code == 2
+        assert 'does not exist' in result.output
+
+    def test_batch(self, tmp_path: Path) -> None:
+        snapshot = tmp_path / 'config.msgpack'
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"host": "foo"}\n')
+
+        command = make_command(batch=True, replay=True)
+        command.main(['--host', 'bar', '--dump-config', str(snapshot)], standalone_mode=False)
+        assert command.main(['--replay', str(snapshot)], standalone_mode=False) == Connection(host='bar')
+
+        result = CliRunner().invoke(command, ['--batch', str(batch_file), '--dump-config', str(snapshot)])
+        assert result.exit_code == 2
+        assert '`--dump-config` cannot be combined with `--batch`' in result.output
+
+    @pytest.mark.parametrize('replay', [False, True])
+    def test_options(self, replay: bool) -> None:  # noqa: FBT001
+        opts = {opt for param in make_command(replay=replay).params for opt in param.opts}
+        assert ('--dump-config' in opts) is replay
+        assert ('--replay' in opts) is replay
+
+
+def make_credentials_command(**kwargs: Any) -> StructCommand:
+    def callback(**values: Any) -> Credentials:
+        return convert(values, Credentials)
+
+    return StructCommand('command', callback=callback, struct=Credentials, **kwargs)
+
+
+class TestPrompts:
+    def test_batched(self) -> None:
+        result = CliRunner().invoke(
+            make_credentials_command(), ['--port', '1'], input='alice\nsecret\n2\n', standalone_mode=False
+        )
+        assert result.exit_code == 0, result.output
+        assert result.return_value == Credentials(user='alice', password='secret', pin=2, port=1)
+        assert result.output.splitlines() == ['User: alice', 'Password: ', 'Pin [0]: 2']
+
+    def test_deferred_until_parsed(self) -> None:
+        result = CliRunner().invoke(make_credentials_command(), ['--port', 'x'], input='alice\nsecret\n2\n')
+        assert result.exit_code == 2
+        assert 'User:' not in result.output
+        assert "Invalid value for '--port'" in result.output
+
+    def test_passed(self) -> None:
+        result = CliRunner().invoke(
+            make_credentials_command(), ['--user', 'alice', '--pin', '2'], input='secret\n', standalone_mode=False
+        )
+        assert result.exit_code == 0, result.output
+        assert result.return_value == Credentials(user='alice', password='secret', pin=2)
+        assert result.output.splitlines() == ['Password: ']
+
+    def test_invalid_value(self) -> None:
+        result = CliRunner().invoke(
+            make_credentials_command(), [], input='alice\nsecret\nx\n2\n', standalone_mode=False
+        )
+        assert result.exit_code == 0, result.output
+        assert result.return_value == Credentials(user='alice', password='secret', pin=2)
+
+    def test_non_interactive(self) -> None:
+        result = CliRunner().invoke(make_credentials_command(interactive=False), ['--pin', '2'])
+        assert result.exit_code == 2
+        assert "Missing values for prompted options: '--user', '--password'" in result.output
+
+    def test_unexposed(self) -> None:
+        CALLED.clear()
+        command = StructCommand('command', struct=Acknowledged, callback=lambda **values: values)
+        result = CliRunner().invoke(command, ['--name', 'foo'], input='yes\n', standalone_mode=False)
+        assert result.exit_code == 0, result.output
+        assert result.return_value == {'name': 'foo'}
+        assert result.output.splitlines() == ['Acknowledged []: yes']
+        assert CALLED == ['yes']
+
+        result = CliRunner().invoke(
+            StructCommand('command', struct=Acknowledged, interactive=False, callback=lambda **values: values), []
+        )
+        assert result.exit_code == 2
+        assert "Missing values for prompted options: '--acknowledged'" in result.output
+
+    def test_batch_records(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"user": "alice", "password": "a"}\n{"user": "bob", "password": "b"}\n')
+
+        command = make_credentials_command(batch=True, interactive=False)
+        result = CliRunner().invoke(command, ['--pin', '1', '--batch', str(batch_file)], standalone_mode=False)
+        assert result.exit_code == 0, result.output
+        assert result.return_value == [
+            Credentials(user='alice', password='a', pin=1),
+            Credentials(user='bob', password='b', pin=1),
+        ]
+
+    def test_batch_records_missing(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"user": "alice"}\n{"user": "bob"}\n')
+
+        command = make_credentials_command(batch=True)
+        result = CliRunner().invoke(
+            command, ['--pin', '1', '--batch', str(batch_file)], input='secret\n', standalone_mode=False
+        )
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines() == ['Password: ']
+        assert result.return_value == [
+            Credentials(user='alice', password='secret', pin=1),
+            Credentials(user='bob', password='secret', pin=1),
+        ]
+
+        result = CliRunner().invoke(
+            make_credentials_command(batch=True, interactive=False), ['--pin', '1', '--batch', str(batch_file)]
+        )
+        assert result.exit_code == 2
+        assert "Missing values for prompted options: '--password'" in result.output
+
+    @pytest.mark.parametrize(('value', 'interactive'), [('1', False), ('true', False), ('0', True), ('false', True)])
+    def test_environment_variable(self, monkeypatch: pytest.MonkeyPatch, value: str, interactive: bool) -> None:  # noqa: FBT001
+        monkeypatch.setenv('MSGSPEC_CLICK_NON_INTERACTIVE', value)
+        result = CliRunner().invoke(make_credentials_command(), [], input='alice\nsecret\n2\n')
+        assert (result.exit_code == 0) is interactive
+
+    def test_environment_variable_overridden(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv('MSGSPEC_CLICK_NON_INTERACTIVE', '1')
+        result = CliRunner().invoke(make_credentials_command(interactive=True), [], input='alice\nsecret\n2\n')
+        assert result.exit_code == 0, result.output
+
+    def test_prompt_file(self, tmp_path: Path) -> None:
+        prompt_file = tmp_path / 'secrets.json'
+        prompt_file.write_text('{"user": "alice", "password": "secret", "pin": "2"}')
+
+        command = make_credentials_command(interactive=False, prompt_file=True)
+        result = CliRunner().invoke(command, ['--prompt-file', str(prompt_file)], standalone_mode=False)
+        assert result.exit_code == 0, result.output
+        assert result.return_value == Credentials(user='alice', password='secret', pin=2)
+        assert not result.output
+
+    def test_prompt_file_stdin(self) -> None:
+        command = make_credentials_command(prompt_file=True)
+        result = CliRunner().invoke(
+            command,
+            ['--prompt-file', '-', '--user', 'bob'],
+            input='{"password": "secret", "pin": "0"}',
+            standalone_mode=False,
+        )
+        assert result.exit_code == 0, result.output
+        assert result.return_value == Credentials(user='bob', password='secret', pin=0)
+
+    def test_prompt_file_partial(self) -> None:
+        command = make_credentials_command(interactive=False, prompt_file=True)
+        result = CliRunner().invoke(command, ['--prompt-file', '-'], input='{"password": "secret"}')
+        assert result.exit_code == 2
+        assert "Missing values for prompted options: '--user', '--pin'" in result.output
+
+    def test_prompt_file_unknown(self) -> None:
+        command = make_credentials_command(prompt_file=True)
+        result = CliRunner().invoke(command, ['--prompt-file', '-'], input='{"port": "1", "foo": "bar"}')
+        assert result.exit_code == 2
+        assert 'unknown prompted options: foo, port' in result.output
+
+    def test_prompt_file_invalid(self) -> None:
+        command = make_credentials_command(prompt_file=True)
+        result = CliRunner().invoke(command, ['--prompt-file', '-'], input='{"user": 1}')
+        assert result.exit_code == 2
+        assert 'invalid JSON object of strings' in result.output
+
+    def test_prompt_file_conversion(self) -> None:
+        command = make_credentials_command(prompt_file=True)
+        result = CliRunner().invoke(
+            command, ['--prompt-file', '-'], input='{"user": "alice", "password": "secret", "pin": "x"}'
+        )
+        assert result.exit_code == 2
+        assert "Invalid value for '--pin': 'x' is not a valid integer" in result.output
+
+    @pytest.mark.parametrize(
+        ('args', 'stdin'),
+        [([], 'secret\ny\n'), (['--prompt-file', '-'], '{"token": "secret", "confirm": "y"}')],
+    )
+    def test_callback(self, args: list[str], stdin: str) -> None:
+        CALLED.clear()
+        command = StructCommand('command', struct=Confirmed, prompt_file=True, callback=lambda **values: values)
+        result = CliRunner().invoke(command, args, input=stdin, standalone_mode=False)
+        assert result.exit_code == 0, result.output
+        assert result.return_value == {'token': 'secret!', 'confirm': True}
+        assert CALLED == ['secret', True]
+
+    def test_chained(self, tmp_path: Path) -> None:
+        prompt_file = tmp_path / 'secrets.json'
+        prompt_file.write_text('{"user": "alice", "password": "secret", "pin": "2"}')
+
+        group = click.Group('group', chain=True)
+        group.add_command(make_credentials_command(prompt_file=True), 'one')
+        group.add_command(make_credentials_command(prompt_file=True), 'two')
+        result = CliRunner().invoke(
+            group,
+            ['one', '--prompt-file', str(prompt_file), 'two', '--user', 'bob', '--pin', '1'],
+            input='hidden\n',
+            standalone_mode=False,
+        )
+        assert result.exit_code == 0, result.output
+        assert result.return_value == [
+            Credentials(user='alice', password='secret', pin=2),
+            Credentials(user='bob', password='hidden', pin=1),
+        ]
+
+
+class TestHelp:
+    def test_memory(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        command = make_command()
+        expected = click.Command.get_help(command, click.Context(command, info_name='command'))
+
+        calls: list[None] = []
+        format_help = StructCommand.format_help
+
+        def counting_format_help(self: StructCommand, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+            calls.append(None)
+            format_help(self, ctx, formatter)
+
+        monkeypatch.setattr(StructCommand, 'format_help', counting_format_help)
+        for _ in range(3):
+            assert command.get_help(click.Context(command, info_name='command')) == expected
+
+        assert len(calls) == 1
+
+        command.get_help(click.Context(command, info_name='command', terminal_width=60))
+        assert len(calls) == 2
+
+    def test_added_params(self, tmp_path: Path) -> None:
+        command = make_command(help_cache_dir=tmp_path)
+        assert '--extra' not in command.get_help(click.Context(command, info_name='command'))
+
+        command.params.append(click.Option(['--extra'], is_flag=True))
+        assert '--extra' in command.get_help(click.Context(command, info_name='command'))
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_disk(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache_dir = tmp_path / 'cache'
+        result = CliRunner().invoke(make_command(help_cache_dir=cache_dir), ['--help'])
+        assert result.exit_code == 0, result.output
+        assert '--host TEXT' in result.output
+        assert len(list(cache_dir.iterdir())) == 1
+
+        def fail(*args: Any, **kwargs: Any) -> None:  # noqa: ARG001
+            raise AssertionError
+
+        monkeypatch.setattr(StructCommand, 'format_help', fail)
+        cached_result = CliRunner().invoke(make_command(help_cache_dir=cache_dir), ['--help'])
+        assert cached_result.exit_code == 0, cached_result.output
+        assert cached_result.output == result.output
+
+    def test_disk_invalidation(self, tmp_path: Path) -> None:
+        class Other(Struct):
+            host: Annotated[str, Meta(extra={'help': 'The host'})]
+
+        CliRunner().invoke(make_command(help_cache_dir=tmp_path), ['--help'])
+        result = CliRunner().invoke(
+            StructCommand('command', struct=Other, help_cache_dir=tmp_path),
+            ['--help'],
+        )
+        assert 'The host' in result.output
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_default_map(self, tmp_path: Path) -> None:
+        command = make_command(help_cache_dir=tmp_path)
+        for port in (10, 99):
+            ctx = click.Context(command, info_name='command', default_map={'port': port}, show_default=True)
+            assert f'[default: {port}]' in command.get_help(ctx)
+
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_disk_callable_default(self, tmp_path: Path) -> None:
+        def make_command_with_callable() -> StructCommand:
+            command = make_command(help_cache_dir=tmp_path)
+            command.params.append(click.Option(['--extra'], default=lambda: 'value'))
+            return command
+
+        commands = [make_command_with_callable() for _ in range(2)]
+        for command in commands:
+            command.get_help(click.Context(command, info_name='command'))
+
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_disk_unencodable_default(self, tmp_path: Path) -> None:
+        command = make_command(help_cache_dir=tmp_path)
+        command.params.append(click.Option(['--extra'], default=object()))
+        assert '--extra' in command.get_help(click.Context(command, info_name='command'))
+        assert not list(tmp_path.iterdir())
+
+    def test_disk_unwritable(self, tmp_path: Path) -> None:
+        cache_file = tmp_path / 'file'
+        cache_file.touch()
+
+        result = CliRunner().invoke(make_command(help_cache_dir=cache_file), ['--help'])
+        assert result.exit_code == 0, result.output
+        assert '--host TEXT' in result.output
+
+
+class TestParser:
+    def test_tables_reused(self) -> None:
+        command = make_command()
+        with command.make_context('command', ['--host', 'foo']) as ctx:
+            parser = command.make_parser(ctx)
+
+        with command.make_context('command', ['--host', 'bar']) as ctx:
+            other = command.make_parser(ctx)
+            assert ctx.params == {'host': 'bar', 'port': 80, 'headers': []}
+
+        assert other is not parser
+        assert other.ctx is ctx
+        assert other._long_opt is parser._long_opt  # noqa: SLF001
+        assert set(other._long_opt) == {'--host', '--port', '--help'}  # noqa: SLF001
+
+    def test_added_params(self) -> None:
+        command = make_command()
+        assert command.main(['--host', 'foo'], standalone_mode=False) == Connection(host='foo')
+
+        command.params.append(click.Option(['--extra'], expose_value=False))
+        assert command.main(['--host', 'foo', '--extra', 'x'], standalone_mode=False) == Connection(host='foo')
+
+    def test_help_option_names(self) -> None:
+        command = make_command()
+        assert CliRunner().invoke(command, ['--help']).exit_code == 0
+
+        result = CliRunner().invoke(command, ['-h'], help_option_names=['-h'])
+        assert result.exit_code == 0, result.output
+        assert '--help' not in result.output
+        assert '-h ' in result.output
+
+        result = CliRunner().invoke(command, ['--help'], help_option_names=['-h'])
+        assert result.exit_code == 2
+
+    def test_help_option_disabled(self) -> None:
+        command = make_command()
+        assert CliRunner().invoke(command, ['--help']).exit_code == 0
+
+        command.add_help_option = False
+        assert CliRunner().invoke(command, ['--help']).exit_code == 2
+
+    def test_token_normalization(self) -> None:
+        command = make_command()
+        assert command.main(['--host', 'foo'], standalone_mode=False) == Connection(host='foo')
+        assert command.main(['--HOST', 'foo'], standalone_mode=False, token_normalize_func=str.lower) == Connection(
+            host='foo'
+        )
+
+    def test_processing_order(self) -> None:
+        command = StructCommand('command', struct=Ordered, callback=lambda **_: None)
+        for _ in range(2):
+            PROCESSED.clear()
+            command.main(['--third', 'x', '--first', 'y'], standalone_mode=False)
+            assert PROCESSED == ['third', 'first', 'second']
@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import Annotated
+
+import pytest
+from msgspec import Meta, Struct
+
+from msgspec_click import compose_options
+from tests.utils import run
+
+
+class HttpConfig(Struct):
+    url: str
+    timeout: Annotated[float, Meta(extra={'params': ['-t', '--timeout']})] = 10.0
+
+
+class DatabaseConfig(Struct):
+    dsn: str = ''
+    timeout: Annotated[float, Meta(extra={'params': ['-t', '--timeout']})] = 5.0
+
+
+class LogConfig(Struct):
+    verbose: bool = False
+
+
+def test_no_conflicts() -> None:
+    composed = compose_options(HttpConfig, LogConfig)
+    assert [option.opts for option in composed.options] == [['--url'], ['-t', '--timeout'], ['--verbose']]
+    assert composed.convert(run(composed.options, ['--url', 'foo', '-t', '1', '--verbose'])) == [
+        HttpConfig(url='foo', timeout=1.0),
+        LogConfig(verbose=True),
+    ]
+
+
+def test_auto_prefix() -> None:
+    composed = compose_options(HttpConfig, DatabaseConfig, LogConfig)
+    assert [option.opts for option in composed.options] == [
+        ['--url'],
+        ['--http-config-timeout'],
+        ['--dsn'],
+        ['--database-config-timeout'],
+        ['--verbose'],
+    ]
+    assert [option.name for option in composed.options] == [
+        'url',
+        'http_config_timeout',
+        'dsn',
+        'database_config_timeout',
+        'verbose',
+    ]
+    assert composed.convert(run(composed.options, ['--url', 'foo', '--database-config-timeout', '1'])) == [
+        HttpConfig(url='foo', timeout=10.0),
+        DatabaseConfig(dsn='', timeout=1.0),
+        LogConfig(verbose=False),
+    ]
+
+
+def test_always_prefix() -> None:
+    composed = compose_options(HttpConfig, LogConfig, prefix=True)
+    assert [option.opts for option in composed.options] == [
+        ['--http-config-url'],
+        ['--http-config-timeout'],
+        ['--log-config-verbose'],
+    ]
+    assert composed.convert(run(composed.options, ['--http-config-url', 'foo', '--log-config-verbose'])) == [
+        HttpConfig(url='foo', timeout=10.0),
+        LogConfig(verbose=True),
+    ]
+
+
+def test_never_prefix() -> None:
+    with pytest.raises(
+        TypeError,
+        match=(
+            r'^Conflicting options: `-t` of `HttpConfig`, `DatabaseConfig`; '
+            r'`--timeout` of `HttpConfig`, `DatabaseConfig`; `timeout` of `HttpConfig`, `DatabaseConfig`$'
+        ),
+    ):
+        compose_options(HttpConfig, DatabaseConfig, prefix=False)
+
+
+def test_same_name_conflict() -> None:
+    class Config(Struct):
+        timeout: float = 0.0
+
+    other = type('Config', (Struct,), {'__annotations__': {'timeout': float}, 'timeout': 1.0})
+    with pytest.raises(TypeError, match=r'^Conflicting options: `--config-timeout` of `Config`, `Config`'):
+        compose_options(Config, other)
+
+
+def test_split() -> None:
+    composed = compose_options(HttpConfig, DatabaseConfig)
+    assert composed.split({'url': 'foo', 'http_config_timeout': 1.0, 'database_config_timeout': 2.0, 'x': 1}) == [
+        {'url': 'foo', 'timeout': 1.0},
+        {'timeout': 2.0},
+    ]
@@ -3,12 +3,39 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from typing import Annotated, Any, Literal, TypedDict, Union
-
+import gc
+import sys
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import TYPE_CHECKING, Annotated, Any, Literal, NamedTuple, TypedDict, Union
+from uuid import UUID  # noqa: TCH003
+
+import click
 import pytest
-from msgspec import Meta, Struct
-
-from msgspec_click import generate_options
+from click.core import ParameterSource
+from click.testing import CliRunner
+from msgspec import Meta, Struct, convert, inspect
+
+from msgspec_click import (
+    LazyStruct,
+    LazyValue,
+    MappedLines,
+    MappedPairs,
+    OptionSpec,
+    StructCommand,
+    collect_sources,
+    compose_options,
+    generate_option_specs,
+    generate_options,
+    generate_params,
+    generate_schema,
+    validate_struct,
+)
+from msgspec_click._core import SETTERS  # noqa: PLC2701
+from tests.utils import run
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 class GoodTypedDict(TypedDict, total=False):
@@ -16,18 +43,225 @@ class GoodTypedDict(TypedDict, total=False):
     key2: str
 
 
+class RequiredLabels(TypedDict):
+    name: str
+    count: int
+
+
+class Labels(RequiredLabels, total=False):
+    ratio: float
+    enabled: bool
+    mode: Literal['a', 'b']
+
+
 class BadTypedDict(TypedDict, total=False):
-    key: int
+    key: list[int]
 
 
 def test_unsupported_type() -> None:
     class Example(Struct):
-        field: set
+        field: UUID
 
     with pytest.raises(TypeError, match='^Unsupported type for field `field`: '):
         generate_options(Example)
 
 
+class DocumentedParent(Struct):
+    name: str = ''
+    """The name"""
+    timeout: int = 5
+    """The timeout"""
+
+
+class DocumentedChild(DocumentedParent):
+    timeout: int = 5
+    """The timeout of the child"""
+
+
+class TestInheritance:
+    def test_reuse_parent(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls: list[inspect.Type] = []
+        setter = SETTERS[inspect.StrType]
+
+        def counting_setter(settings: dict[str, Any], field_type: inspect.Type) -> None:
+            calls.append(field_type)
+            setter(settings, field_type)
+
+        monkeypatch.setitem(SETTERS, inspect.StrType, counting_setter)  # type: ignore[misc]
+
+        class Parent(Struct):
+            field1: str = ''
+            field2: str = ''
+
+        class Child(Parent):
+            field3: str = ''
+
+        parent_options = generate_options(Parent)
+        assert len(calls) == 2
+
+        child_options = generate_options(Child)
+        assert len(calls) == 3
+        assert [option.to_info_dict() for option in child_options[:2]] == [
+            option.to_info_dict() for option in parent_options
+        ]
+        assert child_options[2].opts == ['--field3']
+
+    def test_override(self) -> None:
+        class Parent(Struct):
+            field1: str = ''
+            field2: str = ''
+
+        class Child(Parent):
+            field2: int = 0  # type: ignore[assignment]
+
+        generate_options(Parent)
+        options = generate_options(Child)
+        assert len(options) == 2
+        assert options[0].to_info_dict()['type'] == {'name': 'text', 'param_type': 'String'}
+        assert options[1].to_info_dict()['type'] == {'name': 'integer', 'param_type': 'Int'}
+
+    def test_override_docstring(self) -> None:
+        generate_options(DocumentedParent)
+        options = generate_options(DocumentedChild)
+        assert [option.help for option in options] == ['The name', 'The timeout of the child']
+
+    def test_unsupported_parent(self) -> None:
+        class Parent(Struct):
+            field: Union[UUID, None] = None  # noqa: UP007
+
+        class Child(Parent):
+            field: str = ''  # type: ignore[assignment]
+
+        options = generate_options(Child)
+        assert len(options) == 1
+        assert options[0].to_info_dict()['type'] == {'name': 'text', 'param_type': 'String'}
+
+    def test_repeated(self) -> None:
+        class Example(Struct):
+            field: Annotated[str, Meta(extra={'params': ['-f', '--field']})] = ''
+
+        first = generate_options(Example)
+        second = generate_options(Example)
+        assert first[0] is not second[0]
+        assert first[0].to_info_dict() == second[0].to_info_dict()
+        assert second[0].opts == ['-f', '--field']
+
+
+class TestOptionSpec:
+    def test_fields(self) -> None:
+        class Example(Struct):
+            field: Annotated[list[int], Meta(extra={'help': 'foo'})] = []
+
+        specs = generate_option_specs(Example)
+        assert len(specs) == 1
+
+        spec = specs[0]
+        assert spec.name == 'field'
+        assert spec.params == ('--field',)
+        assert issubclass(spec.cls, click.Option)
+        assert [key for key, _ in spec.settings] == ['help', 'multiple', 'show_default', 'type']
+
+    def test_hashable(self) -> None:
+        class Example(Struct):
+            field1: Annotated[list[str], Meta(extra={'default': ['foo']})] = []
+            field2: Annotated[dict[str, int], Meta(extra={'default': [['foo', 1]]})] = {}
+
+        specs = generate_option_specs(Example)
+        assert len({hash(spec) for spec in specs}) == 2
+        assert specs == generate_option_specs(Example)
+        assert not gc.is_tracked(specs[0])
+
+    def test_to_option(self) -> None:
+        class Example(Struct):
+            field1: Annotated[list[str], Meta(extra={'default': ['foo']})] = []
+            field2: Annotated[dict[str, int], Meta(extra={'default': [['foo', 1]]})] = {}
+
+        specs = generate_option_specs(Example)
+        list_option = specs[0].to_option()
+        dict_option = specs[1].to_option()
+        assert type(list_option.default) is list
+        assert list_option.default == ['foo']
+        assert type(dict_option.default) is list
+        assert dict_option.default == [['foo', 1]]
+        assert type(dict_option.default[0]) is list
+        assert specs[0].to_option().default is not list_option.default
+
+    def test_immutable(self) -> None:
+        spec = OptionSpec(name='field', params=('--field',), cls=click.Option)
+        with pytest.raises(AttributeError):
+            spec.name = 'foo'  # type: ignore[misc]
+
+        assert spec.to_option().opts == ['--field']
+
+
+class TestShared:
+    def test_identity(self) -> None:
+        class Example(Struct):
+            field1: str = ''
+            field2: list[int] = []
+
+        options = generate_options(Example, shared=True)
+        assert [id(option) for option in options] == [id(option) for option in generate_options(Example, shared=True)]
+        assert not any(option in options for option in generate_options(Example))
+
+    def test_inherited(self) -> None:
+        class Parent(Struct):
+            field1: str = ''
+
+        class Child(Parent):
+            field2: str = ''
+
+        parent_options = generate_options(Parent, shared=True)
+        child_options = generate_options(Child, shared=True)
+        assert child_options[0] is parent_options[0]
+        assert child_options[1] is not parent_options[0]
+
+    def test_unhashable_setting(self) -> None:
+        class Example(Struct):
+            field: Annotated[str, Meta(extra={'envvar': {'FOO'}})] = ''
+
+        assert generate_options(Example, shared=True)[0] is not generate_options(Example, shared=True)[0]
+
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_immutable(self, lazy: bool) -> None:  # noqa: FBT001
+        class Example(Struct):
+            field: list[int] = []
+
+        option = generate_options(Example, shared=True, lazy=lazy)[0]
+        with pytest.raises(AttributeError, match='^shared parameter `field` cannot be modified$'):
+            option.hidden = True
+
+        with pytest.raises(AttributeError, match='^shared parameter `field` cannot be modified$'):
+            del option.help
+
+        assert not option.hidden
+
+        unshared = generate_options(Example, lazy=lazy)[0]
+        assert repr(option) == repr(unshared)
+        unshared.hidden = True
+        assert unshared.hidden
+
+    def test_parse_isolation(self) -> None:
+        class Example(Struct):
+            field1: str = ''
+            field2: Annotated[list[int], Meta(extra={'params': ['-f']})] = []
+            field3: Annotated[int, Meta(extra={'params': ['-n']})] = 0
+
+        def callback(**kwargs: Any) -> Example:
+            return convert(kwargs, Example)
+
+        commands = [click.Command(f'command{i}', callback=callback) for i in range(2)]
+        for command in commands:
+            command.params.extend(generate_options(Example, shared=True))
+
+        first = commands[0].main(['--field1', 'foo', '-f', '1', '-f', '2', '-n', '2'], standalone_mode=False)
+        second = commands[1].main(['-f', '3'], standalone_mode=False)
+        third = commands[0].main([], standalone_mode=False)
+        assert first == Example(field1='foo', field2=[1, 2], field3=2)
+        assert second == Example(field1='', field2=[3], field3=0)
+        assert third == Example(field1='', field2=[], field3=0)
+
+
 class TestMetadata:
     def test_full(self) -> None:
         class Example(Struct):
@@ -55,7 +289,6 @@ class TestMetadata:
         }
 
     def test_partial(self) -> None:
-        # This test is purely to satisfy code coverage but does not represent real usage
         class Example(Struct):
             field: Annotated[str, Meta(description='foo')] = ''
 
@@ -66,7 +299,7 @@ class TestMetadata:
             'default': '',
             'envvar': None,
             'flag_value': True,
-            'help': None,
+            'help': 'foo',
             'hidden': False,
             'is_flag': False,
             'multiple': False,
@@ -106,6 +339,142 @@ class TestMetadata:
         }
 
 
+class TestHelp:
+    def test_title(self) -> None:
+        class Example(Struct):
+            field: Annotated[str, Meta(title='foo')] = ''
+
+        assert generate_options(Example)[0].help == 'foo'
+
+    def test_description_precedence(self) -> None:
+        class Example(Struct):
+            field: Annotated[str, Meta(title='foo', description='bar')] = ''
+
+        assert generate_options(Example)[0].help == 'bar'
+
+    def test_extra_precedence(self) -> None:
+        class Example(Struct):
+            field: Annotated[str, Meta(description='foo', extra={'help': 'bar'})] = ''
+            """baz"""
+
+        assert generate_options(Example)[0].help == 'bar'
+
+    def test_docstring(self) -> None:
+        class Example(Struct):
+            field1: str = ''
+            """
+            This is a
+            multi-line docstring.
+            """
+            field2: str = ''
+            field3: Annotated[str, Meta(description='foo')] = ''
+            """bar"""
+
+        options = generate_options(Example)
+        assert [option.help for option in options] == ['This is a\nmulti-line docstring.', None, 'foo']
+
+    def test_docstring_inherited(self) -> None:
+        class Parent(Struct):
+            field1: str = ''
+            """foo"""
+            field2: str = ''
+            """bar"""
+
+        class Child(Parent):
+            field2: str = 'baz'
+            field3: str = ''
+            """qux"""
+
+        options = generate_options(Child)
+        assert [option.help for option in options] == ['foo', 'bar', 'qux']
+
+    def test_docstring_unavailable(self) -> None:
+        example = type('Example', (Struct,), {'__annotations__': {'field': str}, 'field': ''})
+
+        assert generate_options(example)[0].help is None
+
+    def test_docstring_main_module(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(sys.modules, '__main__', ModuleType('__main__'))
+        example = type('Example', (Struct,), {'__annotations__': {'field': str}, 'field': '', '__module__': '__main__'})
+
+        assert generate_options(example)[0].help is None
+
+    def test_constraints(self) -> None:
+        class Example(Struct):
+            field1: Annotated[str, Meta(min_length=1, max_length=10, pattern='^a', description='foo')] = 'a'
+            field2: Annotated[list[str], Meta(min_length=1)] = []
+            field3: Annotated[list[str], Meta(max_length=2)] = []
+            field4: Annotated[float, Meta(multiple_of=0.5)] = 0.0
+
+        options = generate_options(Example)
+        assert [option.help for option in options] == [
+            'foo  [1<=length<=10; pattern: ^a]',
+            '[length>=1]',
+            '[length<=2]',
+            '[multiple of 0.5]',
+        ]
+
+    def test_ranges(self) -> None:
+        class Example(Struct):
+            field1: Annotated[int, Meta(ge=1, le=10)] = 1
+            field2: Annotated[int, Meta(gt=0)] = 1
+            field3: Annotated[float, Meta(gt=0, lt=1)] = 0.5
+            field4: Annotated[float, Meta(le=1)] = 0.5
+
+        options = generate_options(Example)
+        assert [option.to_info_dict()['type'] for option in options] == [
+            {
+                'clamp': False,
+                'max': 10,
+                'max_open': False,
+                'min': 1,
+                'min_open': False,
+                'name': 'integer range',
+                'param_type': 'IntRange',
+            },
+            {
+                'clamp': False,
+                'max': None,
+                'max_open': False,
+                'min': 0,
+                'min_open': True,
+                'name': 'integer range',
+                'param_type': 'IntRange',
+            },
+            {
+                'clamp': False,
+                'max': 1,
+                'max_open': True,
+                'min': 0,
+                'min_open': True,
+                'name': 'float range',
+                'param_type': 'FloatRange',
+            },
+            {
+                'clamp': False,
+                'max': 1,
+                'max_open': False,
+                'min': None,
+                'min_open': False,
+                'name': 'float range',
+                'param_type': 'FloatRange',
+            },
+        ]
+
+    def test_show_default(self) -> None:
+        class Example(Struct):
+            field1: Annotated[int, Meta(ge=0, description='foo')] = 5
+            field2: Annotated[str, Meta(extra={'prompt': True, 'hide_input': True})] = 'secret'
+            field3: Annotated[str, Meta(extra={'show_default': False})] = 'bar'
+
+        command = click.Command('command')
+        command.params.extend(generate_options(Example))
+        help_text = command.get_help(click.Context(command))
+        assert 'foo  [default: 5; x>=0]' in help_text
+        assert 'secret' not in help_text
+        assert 'bar' not in help_text
+
+
 class TestStr:
     def test_required(self) -> None:
         class Example(Struct):
@@ -184,6 +553,29 @@ class TestBool:
             'type': {'name': 'boolean', 'param_type': 'Bool'},
         }
 
+    def test_optional(self) -> None:
+        class Example(Struct):
+            some_field: Union[bool, None] = None  # noqa: UP007
+
+        options = generate_options(Example)
+        assert len(options) == 1
+        assert options[0].opts == ['--some-field']
+        assert options[0].secondary_opts == ['--no-some-field']
+        assert options[0].default is None
+
+        command = click.Command('command', callback=lambda **values: values, params=list(options))
+        assert command.main([], standalone_mode=False) == {'some_field': None}
+        assert command.main(['--some-field'], standalone_mode=False) == {'some_field': True}
+        assert command.main(['--no-some-field'], standalone_mode=False) == {'some_field': False}
+
+    def test_optional_params(self) -> None:
+        class Example(Struct):
+            field: Annotated[Union[bool, None], Meta(extra={'params': ['-f']})] = None  # noqa: UP007
+
+        options = generate_options(Example)
+        assert options[0].opts == ['-f']
+        assert options[0].secondary_opts == []
+
 
 class TestInt:
     def test_basic(self) -> None:
@@ -219,7 +611,7 @@ class TestInt:
         assert len(options) == 1
         assert options[0].to_info_dict() == {
             'count': True,
-            'default': [],
+            'default': 0,
             'envvar': None,
             'flag_value': True,
             'help': None,
@@ -244,6 +636,14 @@ class TestInt:
             },
         }
 
+    def test_count_values(self) -> None:
+        class Example(Struct):
+            verbose: Annotated[int, Meta(extra={'count': True, 'params': ['-v']})] = 0
+
+        command = click.Command('command', callback=lambda **values: values, params=list(generate_options(Example)))
+        assert command.main(['-vvv'], standalone_mode=False) == {'verbose': 3}
+        assert command.main([], standalone_mode=False) == {'verbose': 0}
+
     def test_count_default(self) -> None:
         class Example(Struct):
             field: Annotated[int, Meta(extra={'count': True, 'default': []})] = 0
@@ -252,7 +652,7 @@ class TestInt:
         assert len(options) == 1
         assert options[0].to_info_dict() == {
             'count': True,
-            'default': [],
+            'default': 0,
             'envvar': None,
             'flag_value': True,
             'help': None,
@@ -305,6 +705,106 @@ class TestFloat:
         }
 
 
+class Binary(Struct):
+    data: bytes = b''
+    buffer: bytearray = bytearray()
+    view: Union[memoryview, None] = None  # noqa: UP007
+
+
+def parse_binary(args: list[str], stdin: bytes | None = None) -> Binary:
+    command = click.Command('command', callback=lambda **kwargs: convert(kwargs, Binary))
+    command.params.extend(generate_options(Binary))
+    result = CliRunner().invoke(command, args, input=stdin, standalone_mode=False)
+    if result.exception is not None:
+        raise result.exception
+
+    return result.return_value
+
+
+class TestBytes:
+    def test_info(self) -> None:
+        options = generate_options(Binary)
+        assert len(options) == 3
+        assert options[0].to_info_dict() == {
+            'count': False,
+            'default': b'',
+            'envvar': None,
+            'flag_value': True,
+            'help': None,
+            'hidden': False,
+            'is_flag': False,
+            'multiple': False,
+            'name': 'data',
+            'nargs': 1,
+            'opts': ['--data'],
+            'param_type_name': 'option',
+            'prompt': None,
+            'required': False,
+            'secondary_opts': [],
+            'type': {'name': 'bytes', 'param_type': 'Bytes'},
+        }
+        assert options[0].make_metavar() == 'BASE64|hex:HEX|@FILE|-'
+
+    def test_base64(self) -> None:
+        binary = parse_binary(['--data', 'AAE=', '--buffer', 'AAE=', '--view', 'AAE='])
+        assert binary.data == b'\x00\x01'
+        assert binary.buffer == bytearray(b'\x00\x01')
+        assert isinstance(binary.view, memoryview)
+        assert binary.view.tobytes() == b'\x00\x01'
+
+    def test_hex(self) -> None:
+        binary = parse_binary(['--data', 'hex:00ff', '--buffer', 'hex:00 ff'])
+        assert binary.data == b'\x00\xff'
+        assert binary.buffer == bytearray(b'\x00\xff')
+
+    def test_defaults(self) -> None:
+        assert parse_binary([]) == Binary()
+
+    def test_file(self, tmp_path: Path) -> None:
+        path = tmp_path / 'blob.bin'
+        path.write_bytes(b'\x00' * 10 + b'\xff')
+
+        binary = parse_binary(['--data', f'@{path}', '--buffer', f'@{path}', '--view', f'@{path}'])
+        assert binary.data == b'\x00' * 10 + b'\xff'
+        assert binary.buffer == bytearray(b'\x00' * 10 + b'\xff')
+        assert isinstance(binary.view, memoryview)
+        assert binary.view.readonly
+        assert binary.view[-1] == 0xFF
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        path = tmp_path / 'blob.bin'
+        path.touch()
+
+        binary = parse_binary(['--buffer', f'@{path}', '--view', f'@{path}'])
+        assert binary.buffer == bytearray()
+        assert binary.view is not None
+        assert binary.view.tobytes() == b''
+
+    def test_stdin(self) -> None:
+        assert parse_binary(['--buffer', '-'], stdin=b'\x00\x01').buffer == bytearray(b'\x00\x01')
+
+    @pytest.mark.parametrize(
+        ('value', 'error'),
+        [
+            pytest.param('foo!', "'foo!' is not valid base64", id='base64'),
+            pytest.param('hex:0g', "'hex:0g' is not valid hexadecimal", id='hex'),
+            pytest.param('@missing.bin', "cannot read 'missing.bin': No such file or directory", id='file'),
+        ],
+    )
+    def test_invalid(self, value: str, error: str) -> None:
+        command = click.Command('command')
+        command.params.extend(generate_options(Binary))
+        result = CliRunner().invoke(command, ['--data', value])
+        assert result.exit_code == 2
+        assert error in result.output
+
+    def test_constraints(self) -> None:
+        class Example(Struct):
+            field: Annotated[bytes, Meta(max_length=4)] = b''
+
+        assert generate_options(Example)[0].help == '[length<=4]'
+
+
 class TestUnion:
     def test_unsupported_union(self) -> None:
         class Example(Struct):
@@ -514,6 +1014,82 @@ class TestList:
         }
 
 
+class TestSet:
+    def test_unsupported_item_type(self) -> None:
+        class Example(Struct):
+            field: set[UUID] = set()
+
+        with pytest.raises(
+            TypeError,
+            match=r'^Error generating option for field `field`, type of item is unsupported:',
+        ):
+            generate_options(Example)
+
+    def test_int(self) -> None:
+        class Example(Struct):
+            field: set[int] = set()
+
+        options = generate_options(Example)
+        assert len(options) == 1
+        assert options[0].to_info_dict() == {
+            'count': False,
+            'default': None,
+            'envvar': None,
+            'flag_value': True,
+            'help': None,
+            'hidden': False,
+            'is_flag': False,
+            'multiple': True,
+            'name': 'field',
+            'nargs': 1,
+            'opts': ['--field'],
+            'param_type_name': 'option',
+            'prompt': None,
+            'required': False,
+            'secondary_opts': [],
+            'type': {'name': 'integer', 'param_type': 'Int'},
+        }
+
+    def test_parse(self) -> None:
+        class Example(Struct):
+            tags: set[str] = set()
+            numbers: frozenset[int] = frozenset()
+
+        command = click.Command('command', callback=lambda **kwargs: kwargs)
+        command.params.extend(generate_options(Example))
+        values = command.main(
+            ['--tags', 'a', '--numbers', '1', '--tags', 'a', '--numbers', '01'], standalone_mode=False
+        )
+        assert values == {'tags': {'a'}, 'numbers': {1}}
+        assert type(values['tags']) is set
+        assert convert(values, Example) == Example(tags={'a'}, numbers=frozenset({1}))
+        assert command.main([], standalone_mode=False) == {'tags': set(), 'numbers': set()}
+
+    def test_nargs(self) -> None:
+        class Example(Struct):
+            field: Annotated[set[int], Meta(extra={'nargs': 3})] = set()
+
+        command = click.Command('command', callback=lambda **kwargs: kwargs)
+        command.params.extend(generate_options(Example))
+        assert command.main(['--field', '1', '2', '1'], standalone_mode=False) == {'field': {1, 2}}
+        assert command.main([], standalone_mode=False) == {'field': set()}
+
+    def test_required(self) -> None:
+        class Example(Struct):
+            field: set[str]
+
+        command = click.Command('command')
+        command.params.extend(generate_options(Example))
+        with pytest.raises(click.MissingParameter):
+            command.main([], standalone_mode=False)
+
+    def test_constraints(self) -> None:
+        class Example(Struct):
+            field: Annotated[set[str], Meta(min_length=1)] = set()
+
+        assert generate_options(Example)[0].help == '[length>=1]'
+
+
 class TestTuple:
     def test_unsupported_item_type(self) -> None:
         class Example(Struct):
@@ -1033,16 +1609,17 @@ class TestVarTuple:
 class TestDict:
     def test_unsupported_key_type(self) -> None:
         class Example(Struct):
-            field: dict[int, str] = {}
+            field: dict[UUID, str] = {}
 
         with pytest.raises(
-            TypeError, match=r'^Error generating option for field `field`, only `str` keys are supported$'
+            TypeError,
+            match=r'^Error generating option for field `field`, only `str`, `int`, `float` and `Literal` keys are supported$',
         ):
             generate_options(Example)
 
     def test_unsupported_value_type(self) -> None:
         class Example(Struct):
-            field: dict[str, set] = {}
+            field: dict[str, UUID] = {}
 
         with pytest.raises(
             TypeError, match=r'^Error generating option for field `field`, type of value is unsupported:'
@@ -1240,13 +1817,165 @@ class TestDict:
         }
 
 
+class Limits(Struct):
+    rate: int
+    burst: int = 0
+
+
+class TestMapping:
+    def test_info(self) -> None:
+        class Example(Struct):
+            field: dict[int, Limits] = {}
+
+        options = generate_options(Example)
+        assert len(options) == 1
+        assert options[0].to_info_dict() == {
+            'count': False,
+            'default': None,
+            'envvar': None,
+            'flag_value': True,
+            'help': None,
+            'hidden': False,
+            'is_flag': False,
+            'multiple': True,
+            'name': 'field',
+            'nargs': 2,
+            'opts': ['--field'],
+            'param_type_name': 'option',
+            'prompt': None,
+            'required': False,
+            'secondary_opts': [],
+            'type': {
+                'name': '<integer text>',
+                'param_type': 'Tuple',
+                'types': [{'name': 'integer', 'param_type': 'Int'}, {'name': 'text', 'param_type': 'String'}],
+            },
+        }
+
+    def test_struct_values(self) -> None:
+        class Example(Struct):
+            field: dict[int, Limits] = {}
+
+        command = click.Command('command', callback=lambda **kwargs: kwargs)
+        command.params.extend(generate_options(Example))
+        values = command.main(
+            ['--field', '1', '{"rate": 5}', '--field', '2', '{"rate": "10", "burst": 2}'], standalone_mode=False
+        )
+        assert values == {'field': {1: Limits(rate=5), 2: Limits(rate=10, burst=2)}}
+        assert convert(values, Example) == Example(field={1: Limits(rate=5), 2: Limits(rate=10, burst=2)})
+        assert command.main([], standalone_mode=False) == {'field': {}}
+
+    def test_list_values(self) -> None:
+        class Example(Struct):
+            field: dict[float, list[int]] = {}
+
+        command = click.Command('command', callback=lambda **kwargs: kwargs)
+        command.params.extend(generate_options(Example))
+        assert command.main(['--field', '0.5', '[1, 2]'], standalone_mode=False) == {'field': {0.5: [1, 2]}}
+
+    def test_primitive_values(self) -> None:
+        class Example(Struct):
+            field: dict[int, float] = {}
+
+        command = click.Command('command', callback=lambda **kwargs: kwargs)
+        command.params.extend(generate_options(Example))
+        assert command.main(['--field', '1', '2.5', '--field', '1', '3'], standalone_mode=False) == {'field': {1: 3.0}}
+
+    def test_string_values(self) -> None:
+        class Example(Struct):
+            modes: dict[str, Literal['r', 'w']] = {}
+            limits: dict[str, Union[int, None]] = {}  # noqa: UP007
+            keys: dict[str, bytes] = {}
+            sizes: dict[str, Annotated[int, Meta(ge=0)]] = {}
+
+        command = click.Command('command', callback=lambda **kwargs: convert(kwargs, Example))
+        command.params.extend(generate_options(Example))
+        assert command.main(
+            [
+                '--modes',
+                'a',
+                'r',
+                '--limits',
+                'b',
+                '1',
+                '--limits',
+                'c',
+                'null',
+                '--keys',
+                'd',
+                'aGk=',
+                '--sizes',
+                'e',
+                '2',
+            ],
+            standalone_mode=False,
+        ) == Example(modes={'a': 'r'}, limits={'b': 1, 'c': None}, keys={'d': b'hi'}, sizes={'e': 2})
+
+        result = CliRunner().invoke(command, ['--modes', 'a', 'x'])
+        assert result.exit_code == 2
+        assert "Invalid value for '--modes'" in result.output
+
+    def test_optional_json_values(self) -> None:
+        class Example(Struct):
+            field: dict[str, Union[list[int], None]] = {}  # noqa: UP007
+
+        command = click.Command('command', callback=lambda **kwargs: kwargs)
+        command.params.extend(generate_options(Example))
+        assert command.main(['--field', 'a', '[1]', '--field', 'b', 'null'], standalone_mode=False) == {
+            'field': {'a': [1], 'b': None}
+        }
+
+    def test_literal_keys(self) -> None:
+        class Example(Struct):
+            names: dict[Literal['a', 'b'], str] = {}
+            numbers: dict[Literal[1, 2], bool] = {}
+
+        command = click.Command('command', callback=lambda **kwargs: convert(kwargs, Example))
+        command.params.extend(generate_options(Example))
+        assert command.main(['--names', 'a', 'x', '--numbers', '2', 'true'], standalone_mode=False) == Example(
+            names={'a': 'x'}, numbers={2: True}
+        )
+
+        result = CliRunner().invoke(command, ['--numbers', '3', 'true'])
+        assert result.exit_code == 2
+        assert "'3' is not one of '1', '2'" in result.output
+
+    @pytest.mark.parametrize(
+        ('args', 'error'),
+        [
+            pytest.param(['--field', '1', '{"rate":'], 'Input data was truncated', id='json'),
+            pytest.param(['--field', '1', '{"burst": 1}'], 'Object missing required field `rate`', id='validation'),
+            pytest.param(['--field', 'x', '{}'], "'x' is not a valid integer", id='key'),
+        ],
+    )
+    def test_invalid(self, args: list[str], error: str) -> None:
+        class Example(Struct):
+            field: dict[int, Limits] = {}
+
+        command = click.Command('command')
+        command.params.extend(generate_options(Example))
+        result = CliRunner().invoke(command, args)
+        assert result.exit_code == 2
+        assert error in result.output
+
+    def test_required(self) -> None:
+        class Example(Struct):
+            field: dict[int, Limits]
+
+        command = click.Command('command')
+        command.params.extend(generate_options(Example))
+        with pytest.raises(click.MissingParameter):
+            command.main([], standalone_mode=False)
+
+
 class TestTypedDict:
     def test_unsupported_value_type(self) -> None:
         class Example(Struct):
             field: BadTypedDict = {}
 
         with pytest.raises(
-            TypeError, match=r'^Error generating option for field `field`, key `key` must have a `str` value type$'
+            TypeError,
+            match=r'^Error generating option for field `field`, type of value for key `key` is unsupported: ',
         ):
             generate_options(Example)
 
@@ -1293,6 +2022,60 @@ class TestTypedDict:
             },
         }
 
+    def test_value_types(self) -> None:
+        class Example(Struct):
+            field: Labels = {}  # type: ignore[typeddict-item]
+
+        command = click.Command('command', callback=lambda **kwargs: kwargs)
+        command.params.extend(generate_options(Example))
+        args = [
+            '--field',
+            'name',
+            'foo',
+            '--field',
+            'count',
+            '3',
+            '--field',
+            'ratio',
+            '0.5',
+            '--field',
+            'enabled',
+            'yes',
+        ]
+        values = command.main([*args, '--field', 'mode', 'b'], standalone_mode=False)
+        assert values == {'field': {'name': 'foo', 'count': 3, 'ratio': 0.5, 'enabled': True, 'mode': 'b'}}
+        assert convert(values, Example) == Example(field=values['field'])
+        assert command.main([], standalone_mode=False) == {'field': {}}
+
+    def test_required_keys(self) -> None:
+        class Example(Struct):
+            field: Labels = {}  # type: ignore[typeddict-item]
+
+        command = click.Command('command')
+        command.params.extend(generate_options(Example))
+        result = CliRunner().invoke(command, ['--field', 'ratio', '0.5'])
+        assert result.exit_code == 2
+        assert 'missing required keys: count, name' in result.output
+
+    def test_invalid_value(self) -> None:
+        class Example(Struct):
+            field: Labels = {}  # type: ignore[typeddict-item]
+
+        command = click.Command('command')
+        command.params.extend(generate_options(Example))
+        result = CliRunner().invoke(command, ['--field', 'name', 'foo', '--field', 'count', 'x'])
+        assert result.exit_code == 2
+        assert "'x' is not a valid integer" in result.output
+
+    def test_required(self) -> None:
+        class Example(Struct):
+            field: Labels
+
+        command = click.Command('command')
+        command.params.extend(generate_options(Example))
+        with pytest.raises(click.MissingParameter):
+            command.main([], standalone_mode=False)
+
 
 class TestLiteral:
     def test_unsupported_item_type(self) -> None:
@@ -1336,3 +2119,603 @@ class TestLiteral:
                 'param_type': 'Choice',
             },
         }
+
+
+ARGUMENT = Meta(extra={'argument': True})
+
+
+class Copy(Struct):
+    destination: Annotated[str, ARGUMENT]
+    sources: Annotated[list[str], ARGUMENT] = []
+    force: bool = False
+
+
+class TestArguments:
+    def test_info(self) -> None:
+        params = generate_params(Copy)
+        assert [type(param).__name__ for param in params] == ['Argument', 'ListArgument', 'Option']
+        assert params[0].to_info_dict() == {
+            'default': None,
+            'envvar': None,
+            'multiple': False,
+            'name': 'destination',
+            'nargs': 1,
+            'opts': ['destination'],
+            'param_type_name': 'argument',
+            'required': True,
+            'secondary_opts': [],
+            'type': {'name': 'text', 'param_type': 'String'},
+        }
+        assert params[1].to_info_dict() == {
+            'default': None,
+            'envvar': None,
+            'multiple': False,
+            'name': 'sources',
+            'nargs': -1,
+            'opts': ['sources'],
+            'param_type_name': 'argument',
+            'required': False,
+            'secondary_opts': [],
+            'type': {'name': 'text', 'param_type': 'String'},
+        }
+
+    def test_spec(self) -> None:
+        specs = generate_option_specs(Copy)
+        assert [spec.is_argument for spec in specs] == [True, True, False]
+
+        with pytest.raises(
+            TypeError, match='^Field `destination` is a positional argument, use `generate_params` instead$'
+        ):
+            specs[0].to_option()
+
+    def test_parse(self) -> None:
+        assert convert(run(generate_params(Copy), ['dest', 'a', 'b', '--force']), Copy) == Copy(
+            destination='dest', sources=['a', 'b'], force=True
+        )
+        assert convert(run(generate_params(Copy), ['dest']), Copy) == Copy(destination='dest')
+
+    def test_missing(self) -> None:
+        command = click.Command('command')
+        command.params.extend(generate_params(Copy))
+        result = CliRunner().invoke(command, [])
+        assert result.exit_code == 2
+        assert "Missing argument 'DESTINATION'" in result.output
+
+    def test_default(self) -> None:
+        class Example(Struct):
+            name: Annotated[str, ARGUMENT] = 'foo'
+            number: Annotated[int, ARGUMENT] = 1
+
+        assert convert(run(generate_params(Example), []), Example) == Example()
+        assert convert(run(generate_params(Example), ['bar', '2']), Example) == Example(name='bar', number=2)
+
+    def test_tuple(self) -> None:
+        class Example(Struct):
+            point: Annotated[tuple[int, int], ARGUMENT]
+
+        assert convert(run(generate_params(Example), ['1', '2']), Example) == Example(point=(1, 2))
+
+    def test_generate_options(self) -> None:
+        with pytest.raises(
+            TypeError, match='^Field `destination` is a positional argument, use `generate_params` instead$'
+        ):
+            generate_options(Copy)
+
+    def test_flag(self) -> None:
+        class Example(Struct):
+            field: Annotated[bool, ARGUMENT] = False
+
+        with pytest.raises(
+            TypeError, match='^Error generating option for field `field`, flags cannot be positional arguments$'
+        ):
+            generate_params(Example)
+
+    def test_mapping(self) -> None:
+        class Example(Struct):
+            field: Annotated[dict[str, str], ARGUMENT] = {}
+
+        with pytest.raises(
+            TypeError, match='^Error generating option for field `field`, mappings cannot be positional arguments$'
+        ):
+            generate_params(Example)
+
+    def test_params_conflict(self) -> None:
+        class Example(Struct):
+            field: Annotated[str, Meta(extra={'argument': True, 'params': ['-f']})]
+
+        with pytest.raises(TypeError, match='^Positional argument for field `field` cannot set `params`$'):
+            generate_params(Example)
+
+    def test_command_batch(self, tmp_path: Path) -> None:
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('{"destination": "foo"}\n')
+
+        command = StructCommand('command', struct=Copy, batch=True, callback=lambda **kwargs: convert(kwargs, Copy))
+        assert command.main(['--batch', str(batch_file)], standalone_mode=False) == [Copy(destination='foo')]
+        assert command.main(['bar', 'a'], standalone_mode=False) == Copy(destination='bar', sources=['a'])
+
+        result = CliRunner().invoke(command, [])
+        assert result.exit_code == 2
+        assert "Missing argument '[DESTINATION]'" in result.output
+
+
+class LazyConfig(Struct):
+    name: str
+    count: int = 0
+    items: Annotated[list[int], Meta(extra={'params': ['-i']})] = []
+    labels: dict[str, str] = {}
+    ratio: Union[float, None] = None  # noqa: UP007
+
+
+class TestLazy:
+    def test_raw_values(self) -> None:
+        values = run(generate_options(LazyConfig, lazy=True), ['--name', 'foo', '-i', '1', '-i', '2'])
+        assert isinstance(values['name'], LazyValue)
+        assert values['name'].raw == 'foo'
+        assert isinstance(values['items'], LazyValue)
+        assert list(values['items'].raw) == ['1', '2']
+        assert values['items'].resolve() == [1, 2]
+        assert values['ratio'] is None
+        assert repr(values['name']) == "LazyValue('foo')"
+
+    def test_attribute_access(self) -> None:
+        config = LazyStruct(
+            LazyConfig,
+            run(generate_options(LazyConfig, lazy=True), ['--name', 'foo', '--count', '3', '--labels', 'k', 'v']),
+        )
+        assert config.name == 'foo'
+        assert config.count == 3
+        assert config.labels == {'k': 'v'}
+        assert config.ratio is None
+        assert repr(config) == 'LazyStruct(LazyConfig)'
+
+    def test_unused_fields_not_converted(self) -> None:
+        config = LazyStruct(LazyConfig, run(generate_options(LazyConfig, lazy=True), ['--name', 'foo', '-i', 'bar']))
+        assert config.name == 'foo'
+
+        with pytest.raises(click.BadParameter, match="'bar' is not a valid integer"):
+            _ = config.items
+
+    def test_to_struct(self) -> None:
+        config = LazyStruct(
+            LazyConfig, run(generate_options(LazyConfig, lazy=True), ['--name', 'foo', '-i', '1', '--ratio', '0.5'])
+        )
+        assert config.to_struct() == LazyConfig(name='foo', items=[1], ratio=0.5)
+
+    def test_eager_values(self) -> None:
+        config = LazyStruct(LazyConfig, run(generate_options(LazyConfig), ['--name', 'foo', '-i', '1']))
+        assert config.items == [1]
+        assert config.to_struct() == LazyConfig(name='foo', items=[1])
+
+    def test_unknown_field(self) -> None:
+        config = LazyStruct(LazyConfig, {'name': 'foo'})
+        with pytest.raises(AttributeError, match="^'LazyConfig' object has no field 'foo'$"):
+            _ = config.foo
+
+        with pytest.raises(AttributeError, match="^'LazyConfig' object has no field 'count'$"):
+            _ = config.count
+
+    def test_required(self) -> None:
+        with pytest.raises(click.MissingParameter):
+            run(generate_options(LazyConfig, lazy=True), [])
+
+    def test_callback(self) -> None:
+        class Example(Struct):
+            field: Annotated[int, Meta(extra={'callback': lambda ctx, param, value: value * 2})] = 0  # noqa: ARG005
+
+        assert run(generate_options(Example, lazy=True), ['--field', '2']) == {'field': 4}
+
+    def test_shared(self) -> None:
+        options = generate_options(LazyConfig, lazy=True, shared=True)
+        assert options[0] is generate_options(LazyConfig, lazy=True, shared=True)[0]
+        assert options[0] is not generate_options(LazyConfig, shared=True)[0]
+
+
+class FileConfig(Struct):
+    paths: Annotated[list[str], Meta(extra={'params': ['-p', '--path']})] = []
+    numbers: list[int] = []
+    labels: dict[str, str] = {}
+    weights: dict[str, float] = {}
+    name: str = ''
+
+
+class TestFromFile:
+    def test_options(self) -> None:
+        options = generate_options(FileConfig, from_file=True)
+        assert [option.opts for option in options] == [
+            ['-p', '--path'],
+            ['--path-from-file'],
+            ['--numbers'],
+            ['--numbers-from-file'],
+            ['--labels'],
+            ['--labels-from-file'],
+            ['--weights'],
+            ['--weights-from-file'],
+            ['--name'],
+        ]
+        assert options[1].help == 'Read values from a file, one per line.'
+        assert options[5].help == 'Read `key=value` pairs from a file, one per line.'
+
+    def test_not_passed(self) -> None:
+        assert run(generate_options(FileConfig, from_file=True), ['-p', 'a', '--labels', 'k', 'v']) == {
+            'paths': ['a'],
+            'numbers': [],
+            'labels': {'k': 'v'},
+            'weights': {},
+            'name': '',
+        }
+
+    def test_lines(self, tmp_path: Path) -> None:
+        manifest = tmp_path / 'manifest.txt'
+        manifest.write_bytes(b'foo\r\n\nbar\nb\xc3\xa4z')
+
+        values = run(generate_options(FileConfig, from_file=True), ['--path-from-file', str(manifest)])
+        paths = values['paths']
+        assert isinstance(paths, MappedLines)
+        assert paths.path == str(manifest)
+        assert repr(paths) == f'MappedLines({str(manifest)!r})'
+        assert list(paths) == ['foo', 'bar', 'bäz']
+        # Files are read again for every iteration
+        assert paths.to_list() == ['foo', 'bar', 'bäz']
+
+    def test_lines_with_values(self, tmp_path: Path) -> None:
+        manifest = tmp_path / 'manifest.txt'
+        manifest.write_text('2\n3\n')
+
+        values = run(
+            generate_options(FileConfig, from_file=True), ['--numbers', '1', '--numbers-from-file', str(manifest)]
+        )
+        assert values['numbers'].to_list() == [1, 2, 3]
+
+    def test_lines_conversion_error(self, tmp_path: Path) -> None:
+        manifest = tmp_path / 'manifest.txt'
+        manifest.write_text('1\nfoo\n')
+
+        numbers = iter(
+            run(generate_options(FileConfig, from_file=True), ['--numbers-from-file', str(manifest)])['numbers']
+        )
+        assert next(numbers) == 1
+        with pytest.raises(click.BadParameter, match="'foo' is not a valid integer"):
+            next(numbers)
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        manifest = tmp_path / 'manifest.txt'
+        manifest.touch()
+
+        assert (
+            run(generate_options(FileConfig, from_file=True), ['--numbers-from-file', str(manifest)])[
+                'numbers'
+            ].to_list()
+            == []
+        )
+
+    def test_pairs(self, tmp_path: Path) -> None:
+        pairs = tmp_path / 'pairs.txt'
+        pairs.write_text('a=1\nb=2=3\na=4\n')
+
+        values = run(
+            generate_options(FileConfig, from_file=True),
+            ['--labels', 'c', '0', '--labels-from-file', str(pairs), '--weights-from-file', str(pairs)],
+        )
+        labels = values['labels']
+        assert isinstance(labels, MappedPairs)
+        assert repr(labels) == f'MappedPairs({str(pairs)!r})'
+        assert list(labels.items()) == [('c', '0'), ('a', '1'), ('b', '2=3'), ('a', '4')]
+        assert list(labels) == ['c', 'a', 'b', 'a']
+        assert list(labels.values()) == ['0', '1', '2=3', '4']
+        assert labels.to_dict() == {'c': '0', 'a': '4', 'b': '2=3'}
+
+        with pytest.raises(click.BadParameter, match="'2=3' is not a valid float"):
+            values['weights'].to_dict()
+
+    def test_pairs_invalid(self, tmp_path: Path) -> None:
+        pairs = tmp_path / 'pairs.txt'
+        pairs.write_text('a=1\nb\n')
+
+        labels = run(generate_options(FileConfig, from_file=True), ['--labels-from-file', str(pairs)])['labels']
+        with pytest.raises(click.BadParameter, match='^line #2 of .+ is not a `key=value` pair$'):
+            labels.to_dict()
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        command = StructCommand('command', struct=FileConfig, from_file=True)
+        result = CliRunner().invoke(command, ['--path-from-file', str(tmp_path / 'missing.txt')])
+        assert result.exit_code == 2
+        assert 'does not exist' in result.output
+
+    def test_required(self, tmp_path: Path) -> None:
+        class Example(Struct):
+            items: list[str]
+
+        manifest = tmp_path / 'manifest.txt'
+        manifest.write_text('foo\n')
+
+        command = StructCommand('command', struct=Example, from_file=True, callback=lambda **values: values)
+        assert command.main(['--items-from-file', str(manifest)], standalone_mode=False)['items'].to_list() == ['foo']
+
+        with pytest.raises(click.MissingParameter):
+            command.main([], standalone_mode=False)
+
+    def test_lazy(self, tmp_path: Path) -> None:
+        manifest = tmp_path / 'manifest.txt'
+        manifest.write_text('1\n2\n')
+
+        config = LazyStruct(
+            FileConfig,
+            run(generate_options(FileConfig, from_file=True, lazy=True), ['--numbers-from-file', str(manifest)]),
+        )
+        assert config.numbers.to_list() == [1, 2]
+
+    def test_shared(self, tmp_path: Path) -> None:
+        manifest = tmp_path / 'manifest.txt'
+        manifest.write_text('foo\n')
+
+        options = generate_options(FileConfig, shared=True, from_file=True)
+        assert options[0] is generate_options(FileConfig, shared=True)[0]
+
+        assert run(options, ['--path-from-file', str(manifest)])['paths'].to_list() == ['foo']
+        assert run(options, [])['paths'] == []
+
+    def test_shared_group(self, tmp_path: Path) -> None:
+        manifest = tmp_path / 'manifest.txt'
+        manifest.write_text('foo\n')
+
+        @click.group(params=generate_options(FileConfig, shared=True, from_file=True))
+        def group(**values: Any) -> None:
+            assert values['paths'].to_list() == ['foo']
+
+        @group.command(params=generate_options(FileConfig, shared=True, from_file=True))
+        def command(**values: Any) -> list[str]:
+            return values['paths']
+
+        assert group.main(['--path-from-file', str(manifest), 'command', '-p', 'bar'], standalone_mode=False) == ['bar']
+        assert group.main(['--path-from-file', str(manifest), 'command'], standalone_mode=False) == []
+
+
+@dataclass
+class DataConfig:
+    name: Annotated[str, Meta(extra={'params': ['-n']})]
+    """The name"""
+    count: int = 0
+    items: list[int] = field(default_factory=list)
+
+
+@dataclass
+class ExtendedDataConfig(DataConfig):
+    verbose: bool = False
+
+
+class TupleConfig(NamedTuple):
+    host: str
+    port: int = 80
+    """The port"""
+
+
+class TestInputTypes:
+    def test_dataclass(self) -> None:
+        options = generate_options(DataConfig)
+        assert [option.opts for option in options] == [['-n'], ['--count'], ['--items']]
+        assert options[0].required
+        assert options[0].help == 'The name'
+
+        values = run(generate_options(DataConfig), ['-n', 'foo', '--items', '1', '--items', '2'])
+        assert convert(values, DataConfig) == DataConfig(name='foo', items=[1, 2])
+
+    def test_dataclass_inheritance(self) -> None:
+        parent = generate_option_specs(DataConfig)
+        child = generate_option_specs(ExtendedDataConfig)
+        assert [spec.name for spec in child] == ['name', 'count', 'items', 'verbose']
+        assert all(a is b for a, b in zip(parent, child))
+
+    def test_attrs(self) -> None:
+        attrs = pytest.importorskip('attrs')
+
+        @attrs.define
+        class Example:
+            name: str
+            tags: list[str] = attrs.field(factory=list)
+
+        assert [option.opts for option in generate_options(Example)] == [['--name'], ['--tags']]
+        assert convert(run(generate_options(Example), ['--name', 'foo', '--tags', 'a']), Example) == Example(
+            name='foo', tags=['a']
+        )  # type: ignore[call-arg]
+
+    def test_named_tuple(self) -> None:
+        options = generate_options(TupleConfig)
+        assert [option.opts for option in options] == [['--host'], ['--port']]
+        assert options[1].help == 'The port'
+        assert run(generate_options(TupleConfig), ['--host', 'localhost']) == {'host': 'localhost', 'port': 80}
+
+    def test_named_tuple_lazy(self) -> None:
+        config = LazyStruct(
+            TupleConfig, run(generate_options(TupleConfig, lazy=True), ['--host', 'localhost', '--port', '8080'])
+        )
+        assert config.port == 8080
+        assert config.to_struct() == TupleConfig('localhost', 8080)
+
+    def test_compose(self) -> None:
+        composed = compose_options(DataConfig, TupleConfig)
+        assert composed.convert(run(composed.options, ['-n', 'foo', '--host', 'localhost'])) == [
+            DataConfig(name='foo'),
+            TupleConfig('localhost'),
+        ]
+
+    def test_command(self) -> None:
+        command = StructCommand('command', struct=DataConfig, callback=lambda **values: values)
+        assert command.main(['-n', 'foo', '--count', '2'], standalone_mode=False) == {
+            'name': 'foo',
+            'count': 2,
+            'items': [],
+        }
+
+    def test_cached(self) -> None:
+        assert generate_option_specs(TupleConfig)[0] is generate_option_specs(TupleConfig)[0]
+        assert generate_options(DataConfig, shared=True)[0] is generate_options(DataConfig, shared=True)[0]
+
+    def test_schema(self) -> None:
+        schema = generate_schema(DataConfig)
+        assert schema['$defs']['DataConfig']['properties']['name']['description'] == 'The name'
+        assert convert(run(generate_options(schema), ['-n', 'foo', '--count', '3']), DataConfig) == DataConfig(
+            name='foo', count=3
+        )
+
+    def test_schema_named_tuple(self) -> None:
+        with pytest.raises(
+            TypeError, match='^Type `TupleConfig` is encoded as an array, so its fields have no properties$'
+        ):
+            generate_schema(TupleConfig)
+
+    def test_validate(self) -> None:
+        assert validate_struct(DataConfig) == []
+
+    def test_unsupported(self) -> None:
+        with pytest.raises(
+            TypeError, match='^Unsupported type, expected a struct, dataclass, attrs or NamedTuple type: '
+        ):
+            generate_options(dict)
+
+
+class CamelConfig(Struct, rename='camel'):
+    max_retries: int = 3
+    http_server: str = ''
+    verbose: Union[bool, None] = None  # noqa: UP007
+
+
+class KebabConfig(Struct, rename='kebab'):
+    max_retries: int = 3
+    retry_delay: Annotated[float, Meta(extra={'aliases': ['-d']})] = 1.0
+
+
+class AcronymConfig(Struct, rename={'server': 'HTTPServer'}):
+    server: str = ''
+
+
+class VerbatimConfig(Struct):
+    foo_bar: int = 0
+    fooBar: int = 0  # noqa: N815
+
+
+def verbatim(name: str) -> str:
+    return name
+
+
+class AliasConfig(Struct):
+    timeout: Annotated[float, Meta(extra={'aliases': ['-t', '--wait']})] = 10.0
+    user: Annotated[str, Meta(extra={'params': ['-u'], 'aliases': ['--login']})] = ''
+
+
+class TestNaming:
+    def test_camel(self) -> None:
+        options = generate_options(CamelConfig)
+        assert [(option.opts, option.secondary_opts) for option in options] == [
+            (['--max-retries'], []),
+            (['--http-server'], []),
+            (['--verbose'], ['--no-verbose']),
+        ]
+        assert [option.name for option in options] == ['maxRetries', 'httpServer', 'verbose']
+
+        values = run(generate_options(CamelConfig), ['--max-retries', '5', '--http-server', 'foo', '--no-verbose'])
+        assert convert(values, CamelConfig) == CamelConfig(max_retries=5, http_server='foo', verbose=False)
+
+    def test_kebab(self) -> None:
+        options = generate_options(KebabConfig)
+        assert [option.opts for option in options] == [['--max-retries'], ['--retry-delay', '-d']]
+        # Encoded names that are not identifiers use the name of the field
+        assert [option.name for option in options] == ['max_retries', 'retry_delay']
+
+        values = run(generate_options(KebabConfig, lazy=True), ['--max-retries', '5', '-d', '2'])
+        config = LazyStruct(KebabConfig, values)
+        assert config.max_retries == 5
+        assert config.to_struct() == KebabConfig(max_retries=5, retry_delay=2.0)
+
+    def test_kebab_command(self) -> None:
+        command = StructCommand('command', struct=KebabConfig, callback=lambda **values: values)
+        assert command.main(['--max-retries', '5'], standalone_mode=False) == {'max_retries': 5, 'retry_delay': 1.0}
+
+    def test_kebab_compose(self) -> None:
+        composed = compose_options(KebabConfig)
+        assert composed.convert(run(composed.options, ['--max-retries', '5'])) == [KebabConfig(max_retries=5)]
+
+    def test_acronym(self) -> None:
+        assert generate_options(AcronymConfig)[0].opts == ['--http-server']
+
+    def test_snake(self) -> None:
+        options = generate_options(CamelConfig, naming='snake')
+        assert [option.opts for option in options] == [['--max_retries'], ['--http_server'], ['--verbose']]
+        assert [option.name for option in options] == ['maxRetries', 'httpServer', 'verbose']
+
+    def test_custom(self) -> None:
+        options = generate_params(CamelConfig, naming=lambda name: f'app-{name.lower()}')
+        assert [option.opts for option in options] == [['--app-maxretries'], ['--app-httpserver'], ['--app-verbose']]
+        assert [option.name for option in options] == ['maxRetries', 'httpServer', 'verbose']
+
+    def test_cached_per_naming(self) -> None:
+        assert generate_option_specs(CamelConfig) == generate_option_specs(CamelConfig)
+        assert (
+            generate_option_specs(CamelConfig, naming='snake')[0]
+            is generate_option_specs(CamelConfig, naming='snake')[0]
+        )
+        assert generate_option_specs(CamelConfig, naming='snake') != generate_option_specs(CamelConfig)
+
+    def test_custom_not_cached(self) -> None:
+        assert (
+            generate_option_specs(CamelConfig, naming=verbatim)[0]
+            is not generate_option_specs(CamelConfig, naming=verbatim)[0]
+        )
+
+    def test_custom_only(self, tmp_path: Path) -> None:
+        with pytest.raises(TypeError, match='^`--foo-bar` of field `fooBar` is already used by field `foo_bar`$'):
+            generate_options(VerbatimConfig)
+
+        values = run(generate_options(VerbatimConfig, naming=verbatim, lazy=True), ['--fooBar', '1'])
+        config = LazyStruct(VerbatimConfig, values)
+        assert config.fooBar == 1
+        assert config.to_struct() == VerbatimConfig(fooBar=1)
+
+        snapshot = tmp_path / 'config.msgpack'
+        command = StructCommand(
+            'command',
+            struct=VerbatimConfig,
+            naming=verbatim,
+            replay=True,
+            callback=lambda **values: (values, collect_sources(VerbatimConfig).fields(ParameterSource.COMMANDLINE)),
+        )
+        assert command.main(['--foo_bar', '2', '--dump-config', str(snapshot)], standalone_mode=False) == (
+            {'foo_bar': 2, 'fooBar': 0},
+            ['foo_bar'],
+        )
+        assert command.main(['--replay', str(snapshot)], standalone_mode=False)[0] == {'foo_bar': 2, 'fooBar': 0}
+
+        assert [issue.kind for issue in validate_struct(VerbatimConfig)] == ['conflict']
+        assert validate_struct(VerbatimConfig, naming=verbatim) == []
+
+    def test_aliases(self) -> None:
+        options = generate_options(AliasConfig)
+        assert [option.opts for option in options] == [['--timeout', '-t', '--wait'], ['-u', '--login']]
+        assert [option.name for option in options] == ['timeout', 'user']
+        assert run(generate_options(AliasConfig), ['--wait', '1', '--login', 'foo']) == {'timeout': 1.0, 'user': 'foo'}
+        assert validate_struct(AliasConfig) == []
+
+    def test_argument_aliases(self) -> None:
+        class Example(Struct):
+            path: Annotated[str, Meta(extra={'argument': True, 'aliases': ['-p']})]
+
+        with pytest.raises(TypeError, match='^Positional argument for field `path` cannot set `aliases`$'):
+            generate_params(Example)
+
+    def test_collision(self) -> None:
+        class Example(Struct):
+            max_retries: int = 0
+            maxRetries: int = 0  # noqa: N815
+
+        with pytest.raises(
+            TypeError, match='^`--max-retries` of field `maxRetries` is already used by field `max_retries`$'
+        ):
+            generate_options(Example)
+
+    def test_alias_collision(self) -> None:
+        class Example(Struct):
+            first: Annotated[str, Meta(extra={'aliases': ['-f']})] = ''
+            second: Annotated[str, Meta(extra={'aliases': ['-f']})] = ''
+
+        with pytest.raises(TypeError, match='^`-f` of field `second` is already used by field `first`$'):
+            generate_options(Example)
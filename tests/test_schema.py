@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import Annotated, Any, Literal, Union
+
+import click  # noqa: TCH002
+import msgspec
+import pytest
+from msgspec import Meta, Struct, convert
+
+from msgspec_click import generate_option_specs, generate_options, generate_params, generate_schema
+from tests.utils import run
+
+
+class Config(Struct):
+    name: Annotated[str, Meta(min_length=1, extra={'params': ['-n'], 'callback': None})]
+    count: Annotated[int, Meta(ge=0, description='The count')] = 0
+    """Ignored since there is a description"""
+    ratio: Annotated[float, Meta(lt=1)] = 0.5
+    items: list[int] = []
+    """The items"""
+    labels: dict[str, str] = {}
+    choice: Literal['a', 'b'] = 'a'
+    point: tuple[int, str] = (0, '')
+    limit: Union[int, None] = None  # noqa: UP007
+    verbose: bool = False
+    tags: set[str] = set()
+
+
+def describe(options: list[Any]) -> list[dict[str, Any]]:
+    return [option.to_info_dict() for option in options]
+
+
+def test_msgspec_schema() -> None:
+    schema = msgspec.json.schema(Config)
+    args = ['--name', 'foo', '--count', '2', '--items', '1', '--items', '2', '--labels', 'k', 'v', '--limit', '3']
+    args.extend(('--choice', 'b', '--point', '1', 'x', '--verbose', '--ratio', '0.25', '--tags', 'a', '--tags', 'a'))
+
+    values = run(generate_params(schema), args)
+    assert convert(values, Config) == Config(
+        name='foo',
+        count=2,
+        ratio=0.25,
+        items=[1, 2],
+        labels={'k': 'v'},
+        choice='b',
+        point=(1, 'x'),
+        limit=3,
+        verbose=True,
+        tags={'a'},
+    )
+
+
+def test_round_trip() -> None:
+    schema = generate_schema(Config)
+    assert describe(generate_options(schema)) == describe(generate_options(Config))
+
+    specs = {spec.name: spec for spec in generate_option_specs(schema)}
+    assert specs['name'].params == ('-n', 'name')
+    assert dict(specs['count'].settings)['help'] == 'The count'
+    assert dict(specs['items'].settings)['help'] == 'The items'
+
+
+def test_export() -> None:
+    schema = generate_schema(Config)
+    properties = schema['$defs']['Config']['properties']
+    assert properties['name']['x-click'] == {'params': ['-n'], 'callback': None}
+    assert properties['count']['description'] == 'The count'
+    assert properties['items']['description'] == 'The items'
+    assert 'x-click' not in properties['count']
+
+
+def test_export_runtime_values() -> None:
+    class Example(Struct):
+        field: Annotated[str, Meta(extra={'type': click.Path(), 'envvar': 'FIELD'})] = ''
+
+    properties = generate_schema(Example)['$defs']['Example']['properties']
+    assert properties['field']['x-click'] == {'envvar': 'FIELD'}
+
+
+def test_export_cached() -> None:
+    schema = generate_schema(Config)
+    assert schema == generate_schema(Config)
+
+    # Callers receive their own copy
+    schema['$defs'].clear()
+    assert generate_schema(Config)['$defs']
+
+
+def test_compile_cached() -> None:
+    schema = msgspec.json.schema(Config)
+    specs = generate_option_specs(schema)
+    assert all(spec is other for spec, other in zip(specs, generate_option_specs(msgspec.json.schema(Config))))
+
+
+def test_inline_schema() -> None:
+    schema = {
+        'type': 'object',
+        'properties': {'name': {'type': 'string', 'title': 'The name'}, 'values': {'type': 'object'}},
+        'required': ['name'],
+    }
+    values = run(generate_params(schema), ['--name', 'foo', '--values', 'k', 'v'])
+    assert values == {'name': 'foo', 'values': {'k': 'v'}}
+
+    option = generate_options(schema)[0]
+    assert option.required
+    assert option.help == 'The name'
+
+
+def test_not_object() -> None:
+    with pytest.raises(TypeError, match='^The JSON schema must describe an object with properties$'):
+        generate_options({'type': 'string'})
+
+
+def test_unsupported() -> None:
+    schema = {'type': 'object', 'properties': {'field': {'type': 'string', 'anyOf': [{'type': 'integer'}]}}}
+    with pytest.raises(TypeError, match='^Unsupported JSON schema for field `field`: '):
+        generate_options(schema)
+
+
+def test_unsupported_type() -> None:
+    schema = {'type': 'object', 'properties': {'field': {'type': 'array', 'items': {'type': 'object'}}}}
+    with pytest.raises(TypeError, match='^Error generating option for field `field`, type of item is unsupported'):
+        generate_options(schema)
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated, Any
+
+import click
+from click.core import ParameterSource
+from msgspec import Meta, Struct
+
+from msgspec_click import StructCommand, collect_sources, generate_options, generate_params
+from tests.utils import run
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+class Config(Struct):
+    name: str = ''
+    port: Annotated[int, Meta(extra={'envvar': 'CONFIG_PORT'})] = 80
+    user: Annotated[str, Meta(extra={'prompt': True})] = ''
+    debug: bool = False
+
+
+def test_sources(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('CONFIG_PORT', '8080')
+    monkeypatch.setattr('click.termui.visible_prompt_func', lambda _: 'alice')
+
+    sources = run(
+        generate_options(Config),
+        ['--name', 'foo'],
+        callback=lambda **_: collect_sources(Config),
+        default_map={'debug': True},
+    )
+    assert sources['name'] is ParameterSource.COMMANDLINE
+    assert sources['port'] is ParameterSource.ENVIRONMENT
+    assert sources['user'] is ParameterSource.PROMPT
+    assert sources['debug'] is ParameterSource.DEFAULT_MAP
+    assert len(sources) == 4
+    assert sources.bitmap == bytes((
+        ParameterSource.COMMANDLINE.value,
+        ParameterSource.ENVIRONMENT.value,
+        ParameterSource.PROMPT.value,
+        ParameterSource.DEFAULT_MAP.value,
+    ))
+
+
+def test_query() -> None:
+    sources = run(
+        generate_options(Config), ['--name', 'foo', '--user', 'bar'], callback=lambda **_: collect_sources(Config)
+    )
+    assert sources.fields(ParameterSource.COMMANDLINE) == ['name', 'user']
+    assert sources.fields(ParameterSource.DEFAULT, ParameterSource.ENVIRONMENT) == ['port', 'debug']
+    assert list(sources.items()) == [
+        ('name', ParameterSource.COMMANDLINE),
+        ('port', ParameterSource.DEFAULT),
+        ('user', ParameterSource.COMMANDLINE),
+        ('debug', ParameterSource.DEFAULT),
+    ]
+    assert repr(sources) == 'FieldSources(name=COMMANDLINE, port=DEFAULT, user=COMMANDLINE, debug=DEFAULT)'
+
+
+def test_unknown() -> None:
+    sources = run(generate_options(Config)[:1], [], callback=lambda **_: collect_sources(Config))
+    assert sources['name'] is ParameterSource.DEFAULT
+    assert sources['port'] is None
+    assert sources.bitmap[1] == 0
+
+
+def test_collected_once() -> None:
+    assert run(
+        generate_options(Config),
+        ['--user', 'foo'],
+        callback=lambda **_: collect_sources(Config) is collect_sources(Config),
+    )
+
+
+def test_group() -> None:
+    @click.group(params=generate_params(Config))
+    def group(**_: Any) -> None:
+        assert collect_sources(Config).fields(ParameterSource.COMMANDLINE) == ['user']
+
+    @group.command(params=generate_params(Config))
+    def command(**_: Any) -> list[str]:
+        return collect_sources(Config).fields(ParameterSource.COMMANDLINE)
+
+    assert group.main(['--user', 'foo', 'command', '--user', 'bar', '--port', '1'], standalone_mode=False) == [
+        'port',
+        'user',
+    ]
+
+
+def test_explicit_context() -> None:
+    command = click.Command('command', params=generate_params(Config))
+    with command.make_context('command', ['--user', 'foo', '--debug']) as ctx:
+        assert collect_sources(Config, ctx).fields(ParameterSource.COMMANDLINE) == ['user', 'debug']
+
+
+def test_replay(tmp_path: Path) -> None:
+    snapshot = tmp_path / 'config.msgpack'
+    command = StructCommand('command', struct=Config, callback=lambda **_: collect_sources(Config), replay=True)
+    command.main(['--user', 'foo', '--dump-config', str(snapshot)], standalone_mode=False)
+
+    sources = command.main(['--replay', str(snapshot)], standalone_mode=False)
+    assert sources.fields(ParameterSource.COMMANDLINE) == ['user']
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import sys
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, Literal
+
+import pytest
+from msgspec import Meta, Struct, convert
+
+from msgspec_click import StructCommand, generate_option_specs, generate_options
+
+WORKERS = 16
+CALLS = 2000
+
+Flag = Annotated[str, Meta(extra={'params': ['-f', '--flag'], 'help': 'shared'})]
+
+
+class Base(Struct):
+    flag: Flag = ''
+    """The flag"""
+    count: Annotated[int, Meta(ge=0)] = 0
+    items: list[int] = []
+    mapping: dict[str, float] = {}
+    choice: Literal['a', 'b'] = 'a'
+
+
+class Derived(Base):
+    extra: tuple[int, str] = (0, '')
+
+
+def describe(options: list[Any]) -> list[dict[str, Any]]:
+    return [option.to_info_dict() for option in options]
+
+
+def run_concurrently(func: Any) -> list[Any]:
+    barrier = threading.Barrier(WORKERS)
+
+    def wait_then_call(i: int) -> Any:
+        if i < WORKERS:
+            barrier.wait()
+
+        return func(i)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        return list(executor.map(wait_then_call, range(CALLS)))
+
+
+def test_metadata_not_modified() -> None:
+    class First(Struct):
+        field: Flag = ''
+
+    class Second(Struct):
+        field: Flag = ''
+
+    assert generate_options(First)[0].opts == ['-f', '--flag']
+    assert generate_options(Second)[0].opts == ['-f', '--flag']
+
+
+def test_concurrent_generation() -> None:
+    # New types are used so that the caches start out empty
+    class Parent(Base):
+        pass
+
+    class Child(Parent):
+        other: str = ''
+
+    structs = [Parent, Child]
+    results = run_concurrently(lambda i: describe(generate_options(structs[i % 2])))
+
+    expected = [describe(generate_options(Parent)), describe(generate_options(Child))]
+    for i, result in enumerate(results):
+        assert result == expected[i % 2]
+
+
+def test_concurrent_specs() -> None:
+    class Example(Derived):
+        pass
+
+    results = run_concurrently(lambda _: generate_option_specs(Example))
+    first = results[0]
+    for result in results:
+        assert all(spec is expected for spec, expected in zip(result, first))
+
+
+def test_concurrent_shared() -> None:
+    class Example(Derived):
+        pass
+
+    results = run_concurrently(lambda i: generate_options(Example, shared=True, lazy=i % 2 == 0))
+    for i, result in enumerate(results):
+        expected = results[i % 2]
+        assert all(option is expected_option for option, expected_option in zip(result, expected))
+
+
+def test_concurrent_parsing() -> None:
+    command = StructCommand('command', struct=Derived, callback=lambda **kwargs: convert(kwargs, Derived))
+
+    def parse(i: int) -> Derived:
+        argv = ['-f', str(i), '--count', str(i), '--items', str(i), '--items', '0', '--mapping', 'k', str(i)]
+        argv.extend(('--choice', 'b' if i % 2 else 'a', '--extra', str(i), 'x'))
+        return command.main(argv, standalone_mode=False)
+
+    results = run_concurrently(parse)
+    for i, result in enumerate(results):
+        assert result == Derived(
+            flag=str(i),
+            count=i,
+            items=[i, 0],
+            mapping={'k': float(i)},
+            choice='b' if i % 2 else 'a',
+            extra=(i, 'x'),
+        )
+
+
+def test_concurrent_help_options() -> None:
+    command = StructCommand('command', struct=Derived, callback=lambda **kwargs: kwargs['count'])
+    help_option_names = [['--help'], ['-h'], ['-?', '--usage']]
+
+    def parse(i: int) -> int:
+        return command.main(
+            ['--count', str(i)], standalone_mode=False, help_option_names=help_option_names[i % len(help_option_names)]
+        )
+
+    assert run_concurrently(parse) == list(range(CALLS))
+
+
+def test_subinterpreter() -> None:
+    interpreters = pytest.importorskip('_interpreters' if sys.version_info >= (3, 13) else '_xxsubinterpreters')
+
+    code = textwrap.dedent(
+        f"""
+        import sys
+        sys.path[:] = {sys.path!r}
+
+        from typing import Annotated
+
+        from msgspec import Meta, Struct, convert
+
+        from msgspec_click import StructCommand
+
+        class Config(Struct):
+            name: str
+            items: Annotated[list[int], Meta(extra={{'params': ['-i']}})] = []
+
+        command = StructCommand('command', struct=Config, callback=lambda **kwargs: convert(kwargs, Config))
+        result = command.main(['--name', 'foo', '-i', '1', '-i', '2'], standalone_mode=False)
+        assert result == Config(name='foo', items=[1, 2]), result
+        """
+    )
+
+    interpreter = interpreters.create()
+    try:
+        # Extension modules such as msgspec may not support being loaded in isolated interpreters
+        if interpreters.run_string(interpreter, 'import msgspec') is not None:
+            pytest.skip('msgspec cannot be loaded in sub-interpreters')
+
+        assert interpreters.run_string(interpreter, code) is None
+    finally:
+        interpreters.destroy(interpreter)
@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import Annotated, Any, Union
+from uuid import UUID  # noqa: TCH003
+
+import click
+import msgspec
+import pytest
+from msgspec import Meta, Struct
+
+from msgspec_click import FieldIssue, generate_options, validate_struct
+
+
+class CustomOption(click.Option):
+    def __init__(self, *args: Any, custom: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.custom = custom
+
+
+class Valid(Struct):
+    name: Annotated[str, Meta(extra={'params': ['-n'], 'envvar': 'NAME', 'help': 'The name'})]
+    path: Annotated[str, Meta(extra={'argument': True, 'envvar': 'PATH'})] = ''
+    count: Annotated[int, Meta(extra={'count': True})] = 0
+
+
+def test_valid() -> None:
+    assert validate_struct(Valid) == []
+
+
+def test_unsupported() -> None:
+    class Example(Struct):
+        first: Union[UUID, None] = None  # noqa: UP007
+        valid: str = ''
+        second: Union[int, str] = 0  # noqa: UP007
+        third: list[list[int]] = []
+
+    assert validate_struct(Example) == [
+        FieldIssue(
+            field='first',
+            kind='unsupported',
+            message="Unsupported type for field `first`: <class 'msgspec.inspect.UUIDType'>",
+        ),
+        FieldIssue(
+            field='second',
+            kind='unsupported',
+            message='Only `TYPE_DEF | None` union types are supported for field `second`: '
+            'UnionType(types=(IntType(gt=None, ge=None, lt=None, le=None, multiple_of=None), '
+            'StrType(min_length=None, max_length=None, pattern=None)))',
+        ),
+        FieldIssue(
+            field='third',
+            kind='unsupported',
+            message="Error generating option for field `third`, type of item is unsupported: <class 'msgspec.inspect.ListType'>",
+        ),
+    ]
+
+
+def test_conflicts() -> None:
+    class Example(Struct):
+        first: Annotated[str, Meta(extra={'params': ['-f', '--flag']})] = ''
+        second: Annotated[str, Meta(extra={'params': ['-f']})] = ''
+        flag: Annotated[bool, Meta(extra={'params': ['--flag/--no-flag']})] = False
+
+    assert validate_struct(Example) == [
+        FieldIssue(field='second', kind='conflict', message='`-f` is already used by field `first`'),
+        FieldIssue(field='flag', kind='conflict', message='`--flag` is already used by field `first`'),
+    ]
+
+
+def test_unknown_keys() -> None:
+    class Example(Struct):
+        option: Annotated[str, Meta(extra={'helps': 'typo', 'envvar': 'OPTION'})] = ''
+        argument: Annotated[str, Meta(extra={'argument': True, 'prompt': True})] = ''
+
+    assert validate_struct(Example) == [
+        FieldIssue(field='option', kind='unknown-key', message='Unknown key `helps` for `Option`'),
+        FieldIssue(field='argument', kind='unknown-key', message='Unknown key `prompt` for `Argument`'),
+    ]
+
+
+def test_custom_class() -> None:
+    class Example(Struct):
+        field: Annotated[str, Meta(extra={'cls': CustomOption, 'custom': True, 'hidden': True, 'other': 1})] = ''
+
+    assert validate_struct(Example) == [
+        FieldIssue(field='field', kind='unknown-key', message='Unknown key `other` for `CustomOption`'),
+    ]
+
+
+def test_not_cached() -> None:
+    class Example(Struct):
+        field: Union[UUID, None] = None  # noqa: UP007
+
+    assert len(validate_struct(Example)) == 1
+    assert validate_struct(Example) == validate_struct(Example)
+
+
+def test_report_encodable() -> None:
+    class Example(Struct):
+        field: Union[UUID, None] = None  # noqa: UP007
+
+    issues = validate_struct(Example)
+    assert msgspec.json.decode(msgspec.json.encode(issues), type=list[FieldIssue]) == issues
+
+
+def test_matches_generation() -> None:
+    class Example(Struct):
+        field: Union[UUID, None] = None  # noqa: UP007
+
+    issue = validate_struct(Example)[0]
+    with pytest.raises(TypeError) as e:
+        generate_options(Example)
+
+    assert str(e.value) == issue.message
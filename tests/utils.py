@@ -0,0 +1,19 @@
+# SPDX-FileCopyrightText: 2024-present Ofek Lev <oss@ofek.dev>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+def run(
+    params: Iterable[click.Parameter], args: list[str], *, callback: Callable[..., Any] | None = None, **kwargs: Any
+) -> Any:
+    # The callback returns the parsed values by default, and all other arguments are passed to `main`
+    command = click.Command('command', params=list(params), callback=callback or (lambda **values: values))
+    return command.main(args, standalone_mode=False, **kwargs)